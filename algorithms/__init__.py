@@ -1,6 +1,22 @@
-from .fp_tree_construction import fp_tree_construction, Node, HeaderTable
+from .fp_tree_construction import fp_tree_construction, encode_dataset, build_tree, Node, SlotNode, HeaderTable
+from .array_fp_tree import ArrayFPTree, ArrayHeaderTable
+from .item_dictionary import ItemDictionary
 from .maximal_closed_itemset_mining import find_maximal_itemsets, find_closed_itemsets, find_closed_maximal, sort_frequent_itemsets
-from .pattern_fragment_growth import fp_growth
+from .pattern_fragment_growth import fp_growth, iter_fp_growth, fp_close, fp_max, fp_growth_top_k
+from .partitioned_mining import partitioned_fp_growth
+from .incremental_fp_tree import update_fp_tree
+from .stream_mining import SlidingWindowMiner
+from .fp_tree_storage import save_fp_tree, load_fp_tree
+from .result_cache import ResultCache, dataset_fingerprint
+from .association_rules import association_rules, iter_association_rules
+from .vertical_mining import eclat, mine_frequent_itemsets
+from .mining_stats import MiningStats
 
 __all__ = ["fp_growth_algorithm", "find_maximal_itemsets", "find_closed_itemsets", "find_closed_maximal", "Node", "HeaderTable", "fp_growth",
-           "sort_frequent_itemsets", "fp_tree_construction"]
\ No newline at end of file
+           "sort_frequent_itemsets", "fp_tree_construction", "SlotNode", "ArrayFPTree", "ArrayHeaderTable",
+           "ItemDictionary", "encode_dataset", "build_tree", "partitioned_fp_growth", "fp_close", "fp_max",
+           "fp_growth_top_k", "update_fp_tree",
+           "SlidingWindowMiner", "save_fp_tree", "load_fp_tree",
+           "ResultCache", "dataset_fingerprint", "iter_fp_growth",
+           "association_rules", "iter_association_rules", "eclat", "mine_frequent_itemsets",
+           "MiningStats"]
\ No newline at end of file
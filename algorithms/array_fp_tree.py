@@ -0,0 +1,218 @@
+"""
+Classes for storing the FP-tree in parallel typed arrays instead of Node objects.
+"""
+
+
+from array import array
+
+
+class ArrayFPTree:
+    """
+    FP-tree stored in parallel typed arrays.
+
+    Every node is identified by its index in the arrays, and the root is always the node 0. Items are
+    stored as their integer ids in the ItemDictionary of the tree. A value of -1 in the index arrays
+    means that there is no such node (the root has no parent, the last node of a chain has no link...).
+    While the tree is built, children are also indexed by parent and item in a dictionary, so they are
+    found without walking the list of siblings. The index can be released with `compact` once the tree
+    is complete, and it is rebuilt automatically if more transactions are inserted later.
+
+    Arguments:
+        n_items (int): Number of different item ids.
+    """
+    def __init__(self, n_items: int):
+        self.n_items = n_items
+        self.item = array("i", [-1])         # Item id of each node
+        self.count = array("q", [0])         # Support of each node
+        self.parent = array("i", [-1])       # Index of the parent node
+        self.node_link = array("i", [-1])    # Index of the next node with the same item
+        self.first_child = array("i", [-1])  # Index of the first child node
+        self.next_sibling = array("i", [-1]) # Index of the next node with the same parent
+        self.child_index = {}                # Index of each child, keyed by parent * n_items + item
+
+    def __len__(self):
+        """Returns the number of nodes in the tree, including the root."""
+        return len(self.item)
+
+    def add_node(self, item: int, parent: int, count: int = 1):
+        """
+        Creates a new node as the first child of `parent`.
+
+        Arguments:
+            item (int): Id of the item associated with the node.
+            parent (int): Index of the parent node.
+            count (int): Initial support of the node (default is 1).
+
+        Returns:
+            int: Index of the new node.
+        """
+        index = len(self.item)
+        self.item.append(item)
+        self.count.append(count)
+        self.parent.append(parent)
+        self.node_link.append(-1)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[parent])
+        self.first_child[parent] = index
+        if self.child_index is not None:
+            self.child_index[parent * self.n_items + item] = index
+        return index
+
+    def find_child(self, parent: int, item: int):
+        """
+        Searches the child of `parent` with the given item.
+
+        Arguments:
+            parent (int): Index of the parent node.
+            item (int): Id of the item to search.
+
+        Returns:
+            int: Index of the child node, or -1 if it does not exist.
+        """
+        if self.child_index is not None:
+            return self.child_index.get(parent * self.n_items + item, -1)
+        child = self.first_child[parent]
+        while child != -1 and self.item[child] != item:
+            child = self.next_sibling[child]
+        return child
+
+    def children(self, index: int):
+        """
+        Iterates over the indexes of the children of a node.
+
+        Arguments:
+            index (int): Index of the parent node.
+        """
+        child = self.first_child[index]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def compact(self):
+        """
+        Releases the dictionary used to find the children of the nodes during the construction.
+        """
+        self.child_index = None
+
+    def insert(self, items: list, header_table, count: int = 1):
+        """
+        Inserts a transaction into the tree, creating the nodes that do not exist yet.
+
+        Arguments:
+            items (list): Item ids of the transaction, sorted in the order of the tree.
+            header_table (ArrayHeaderTable): Header table for tracking nodes with same items.
+            count (int): Number of times the transaction appears in the dataset (default is 1).
+        """
+        n_items = self.n_items
+        if self.child_index is None:
+            self.child_index = {self.parent[i] * n_items + self.item[i]: i for i in range(1, len(self.item))}
+
+        node = 0
+        child_index = self.child_index
+        for item in items:
+            child = child_index.get(node * n_items + item, -1)
+            if child == -1:
+                child = self.add_node(item, node, count)
+                header_table.add_node_link(child)
+            else:
+                self.count[child] += count
+            node = child
+
+    def prefix_path(self, index: int):
+        """
+        Returns the item ids from the root to the given node, both excluded.
+
+        Arguments:
+            index (int): Index of the node.
+        """
+        path = []
+        node = self.parent[index]
+        while node > 0:
+            path.append(self.item[node])
+            node = self.parent[node]
+        path.reverse()
+        return path
+
+
+class ArrayHeaderTable:
+    """
+    Header table of an ArrayFPTree.
+
+    It exposes the same interface as HeaderTable, but the "node" and "tail" entries of the table are
+    node indexes of the array tree instead of Node references.
+
+    Arguments:
+        item_support (dict): Dictionary with the counter of each item id in the dataset.
+        tree (ArrayFPTree): Tree whose nodes are linked by this table.
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids (default is None).
+    """
+    backend = "array"
+
+    def __init__(self, item_support: dict, tree: ArrayFPTree, item_dictionary=None):
+        self.tree = tree
+        self.item_dictionary = item_dictionary
+        self.table = {}
+        for item, count in item_support.items():
+            self.add_item(item, count)
+
+    def add_item(self, item, count: int = 0):
+        """
+        Adds an item without nodes at the end of the table.
+
+        Arguments:
+            item (int): Id of the item.
+            count (int): Support of the item (default is 0).
+        """
+        self.table[item] = {
+            "node": None,
+            "count": count,
+            "tail": None,
+            "nodes": 0
+        }
+
+    def add_node_link(self, index: int):
+        """
+        Adds a node link to the chain of the item of the given node.
+
+        Arguments:
+            index (int): Index of the node in the tree.
+        """
+        entry = self.table[self.tree.item[index]]
+        if entry["node"] is None:
+            entry["node"] = index
+        else:
+            self.tree.node_link[entry["tail"]] = index
+        entry["tail"] = index
+        entry["nodes"] += 1
+
+    def get(self, value):
+        """
+        Gets the header table entry of item `value`.
+
+        Arguments:
+            value (int): Value to search in the header table.
+
+        Returns:
+            dict: Index of the first node with item `value` and its support.
+        """
+        return self.table[value]
+
+    def items(self):
+        """Returns all items in the header table."""
+        return self.table
+
+    def prefix_paths(self, value):
+        """
+        Iterates over the prefix paths of the nodes with item `value`, following the node links.
+
+        Arguments:
+            value (int): Value to search in the header table.
+
+        Yields:
+            tuple: The list of items from the root to the node (both excluded) and the node counter.
+        """
+        tree = self.tree
+        index = self.table[value]["node"]
+        while index is not None and index != -1:
+            yield tree.prefix_path(index), tree.count[index]
+            index = tree.node_link[index]
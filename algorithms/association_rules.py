@@ -0,0 +1,244 @@
+"""
+Functions for generating association rules from the frequent itemsets.
+
+NumPy is an optional dependency. When it is installed, the metrics of the rules are computed and
+filtered in vectorized batches by default.
+"""
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Number of candidate rules whose metrics are computed at once in the vectorized path
+RULE_BATCH_SIZE = 65536
+
+# Fields of each rule, in the order in which they are yielded
+RULE_FIELDS = ("antecedent", "consequent", "support", "confidence", "lift", "leverage")
+
+
+class SupportIndex:
+    """
+    Index of the support of the frequent itemsets, keyed by their sets of items.
+
+    The itemsets of fp_growth are tuples of item ids in the order they were found, so a subset cannot be
+    looked up without sorting it first. As frozensets, the key of the antecedent of a rule is the key of
+    its itemset minus the items of the consequent, and the size of every key depends only on the length
+    of its itemset.
+
+    Arguments:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys.
+    """
+    def __init__(self, frequent_itemsets: dict):
+        self.supports = {frozenset(itemset): support for itemset, support in frequent_itemsets.items()}
+
+    def __len__(self):
+        """Returns the number of indexed itemsets."""
+        return len(self.supports)
+
+    def support(self, itemset):
+        """
+        Returns the support of an itemset.
+
+        Arguments:
+            itemset (iterable): Item ids of the itemset.
+        """
+        return self.supports[frozenset(itemset)]
+
+
+def _next_consequents(consequents: list):
+    """
+    Generates the candidate consequents with one more item from the ones that passed the confidence
+    threshold, joining the pairs that share all but their last item (as in Apriori). A candidate is
+    discarded if any of its subsets failed, since confidence is anti-monotone in the consequent.
+
+    Arguments:
+        consequents (list): Sorted tuples of the item ids of the consequents that passed, all of the same length.
+
+    Returns:
+        list: Sorted tuples of the candidate consequents.
+    """
+    passed = set(consequents)
+    candidates = []
+    for i, first in enumerate(consequents):
+        for second in consequents[i + 1:]:
+            if first[:-1] != second[:-1]:
+                break
+            candidate = first + second[-1:]
+            if all(candidate[:j] + candidate[j + 1:] in passed for j in range(len(candidate) - 2)):
+                candidates.append(candidate)
+    return candidates
+
+
+def _candidate_rules(support_index: SupportIndex, frequent_itemsets: dict, min_confidence: float):
+    """
+    Generates the rules of each frequent itemset that reach the minimum confidence.
+
+    The consequents of the rules of an itemset grow one item at a time. Moving an item from the antecedent
+    to the consequent can only increase the support of the antecedent, and so decrease the confidence, so
+    only the consequents that pass the threshold are extended.
+
+    Arguments:
+        support_index (SupportIndex): Index of the support of the frequent itemsets.
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys.
+        min_confidence (float): Minimum confidence of the rules.
+
+    Yields:
+        tuple: Antecedent and consequent item ids, and the supports of the itemset, the antecedent and the consequent.
+    """
+    supports = support_index.supports
+    for itemset, support in frequent_itemsets.items():
+        if len(itemset) < 2:
+            continue
+        items = frozenset(itemset)
+
+        consequents = [(item,) for item in sorted(items)]
+        while consequents and len(consequents[0]) < len(items):
+            passed = []
+            for consequent in consequents:
+                consequent_items = frozenset(consequent)
+                antecedent = items - consequent_items
+                antecedent_support = supports[antecedent]
+                if support >= min_confidence * antecedent_support:
+                    passed.append(consequent)
+                    yield (tuple(sorted(antecedent)), consequent, support, antecedent_support,
+                           supports[consequent_items])
+            consequents = _next_consequents(passed)
+
+
+def _python_metrics(candidates, n_transactions: int, min_lift: float, min_leverage: float):
+    """
+    Computes the metrics of the candidate rules one by one and filters them.
+
+    Arguments:
+        candidates (iterable): Candidate rules, as yielded by _candidate_rules.
+        n_transactions (int): Number of transactions of the dataset.
+        min_lift (float): Minimum lift of the rules, or None.
+        min_leverage (float): Minimum leverage of the rules, or None.
+
+    Yields:
+        tuple: The rules, with the fields of RULE_FIELDS.
+    """
+    for antecedent, consequent, support, antecedent_support, consequent_support in candidates:
+        confidence = support / antecedent_support
+        lift = confidence * n_transactions / consequent_support
+        leverage = (support - antecedent_support * consequent_support / n_transactions) / n_transactions
+        if (min_lift is None or lift >= min_lift) and (min_leverage is None or leverage >= min_leverage):
+            yield antecedent, consequent, support, confidence, lift, leverage
+
+
+def _numpy_metrics(candidates, n_transactions: int, min_lift: float, min_leverage: float, batch_size: int):
+    """
+    Computes the metrics of the candidate rules in vectorized batches and filters them.
+
+    Arguments:
+        candidates (iterable): Candidate rules, as yielded by _candidate_rules.
+        n_transactions (int): Number of transactions of the dataset.
+        min_lift (float): Minimum lift of the rules, or None.
+        min_leverage (float): Minimum leverage of the rules, or None.
+        batch_size (int): Number of candidate rules processed at once.
+
+    Yields:
+        tuple: The rules, with the fields of RULE_FIELDS.
+    """
+    batch = []
+    for candidate in candidates:
+        batch.append(candidate)
+        if len(batch) == batch_size:
+            yield from _numpy_batch(batch, n_transactions, min_lift, min_leverage)
+            batch = []
+    if batch:
+        yield from _numpy_batch(batch, n_transactions, min_lift, min_leverage)
+
+
+def _numpy_batch(batch: list, n_transactions: int, min_lift: float, min_leverage: float):
+    """
+    Computes and filters the metrics of a batch of candidate rules with NumPy.
+
+    Arguments:
+        batch (list): Candidate rules, as yielded by _candidate_rules.
+        n_transactions (int): Number of transactions of the dataset.
+        min_lift (float): Minimum lift of the rules, or None.
+        min_leverage (float): Minimum leverage of the rules, or None.
+
+    Yields:
+        tuple: The rules, with the fields of RULE_FIELDS.
+    """
+    supports = np.array([candidate[2:] for candidate in batch], dtype=np.float64)
+    support, antecedent_support, consequent_support = supports.T
+    confidence = support / antecedent_support
+    lift = confidence * n_transactions / consequent_support
+    leverage = (support - antecedent_support * consequent_support / n_transactions) / n_transactions
+
+    keep = np.ones(len(batch), dtype=bool)
+    if min_lift is not None:
+        keep &= lift >= min_lift
+    if min_leverage is not None:
+        keep &= leverage >= min_leverage
+
+    for i in np.flatnonzero(keep).tolist():
+        antecedent, consequent, count = batch[i][:3]
+        yield antecedent, consequent, count, confidence[i].item(), lift[i].item(), leverage[i].item()
+
+
+def iter_association_rules(frequent_itemsets: dict, n_transactions: int, min_confidence: float = 0.5,
+                           min_lift: float = None, min_leverage: float = None, vectorized: bool = None,
+                           batch_size: int = RULE_BATCH_SIZE):
+    """
+    Generates the association rules of the frequent itemsets, yielding them as they are found.
+
+    For a rule A => C of the itemset A ∪ C:
+
+    - confidence = support(A ∪ C) / support(A)
+    - lift = confidence / (support(C) / n_transactions)
+    - leverage = (support(A ∪ C) - support(A) * support(C) / n_transactions) / n_transactions
+
+    Arguments:
+        frequent_itemsets (dict): Dictionary with all the frequent itemsets, with tuples of item ids as keys,
+            as returned by fp_growth. Every subset of an itemset must be in it.
+        n_transactions (int): Number of transactions of the dataset.
+        min_confidence (float): Minimum confidence of the rules (default=0.5).
+        min_lift (float): Minimum lift of the rules, or None for no threshold (default=None).
+        min_leverage (float): Minimum leverage of the rules, or None for no threshold (default=None).
+        vectorized (bool): Whether to compute the metrics in batches with NumPy. If it is None, they are computed
+            with NumPy when it is installed (default=None).
+        batch_size (int): Number of candidate rules of each batch of the vectorized path (default=RULE_BATCH_SIZE).
+
+    Yields:
+        tuple: Antecedent (tuple of item ids), consequent (tuple of item ids), support (count of transactions
+            with both), confidence, lift and leverage of each rule, as in RULE_FIELDS.
+    """
+    if n_transactions < 1:
+        raise ValueError("The number of transactions must be positive.")
+
+    support_index = SupportIndex(frequent_itemsets)
+    candidates = _candidate_rules(support_index, frequent_itemsets, min_confidence)
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized and np is not None:
+        return _numpy_metrics(candidates, n_transactions, min_lift, min_leverage, batch_size)
+    return _python_metrics(candidates, n_transactions, min_lift, min_leverage)
+
+
+def association_rules(frequent_itemsets: dict, n_transactions: int, min_confidence: float = 0.5,
+                      min_lift: float = None, min_leverage: float = None, vectorized: bool = None):
+    """
+    Finds the association rules of the frequent itemsets.
+
+    Arguments:
+        frequent_itemsets (dict): Dictionary with all the frequent itemsets, with tuples of item ids as keys,
+            as returned by fp_growth.
+        n_transactions (int): Number of transactions of the dataset.
+        min_confidence (float): Minimum confidence of the rules (default=0.5).
+        min_lift (float): Minimum lift of the rules, or None for no threshold (default=None).
+        min_leverage (float): Minimum leverage of the rules, or None for no threshold (default=None).
+        vectorized (bool): Whether to compute the metrics in batches with NumPy. If it is None, they are computed
+            with NumPy when it is installed (default=None).
+
+    Returns:
+        list: The rules, as tuples with the fields of RULE_FIELDS.
+    """
+    return list(iter_association_rules(frequent_itemsets, n_transactions, min_confidence, min_lift, min_leverage,
+                                       vectorized))
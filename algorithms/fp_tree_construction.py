@@ -3,7 +3,16 @@ Classes and functions for constructing the FP-tree.
 """
 
 
-from utils.conversions import transaction_to_binary
+from contextlib import nullcontext
+
+from algorithms.array_fp_tree import ArrayFPTree, ArrayHeaderTable
+from algorithms.item_dictionary import ItemDictionary
+from utils.binary_matrix import BinaryMatrix
+from utils.loaders import is_blank_row
+
+
+# Value of the root node. Items are encoded as non-negative integer ids
+ROOT = -1
 
 
 class Node:
@@ -11,38 +20,42 @@ class Node:
     Tree node class for the creation of a tree structure.
 
     Arguments:
-        value (str): Value associated with the node.
+        value (int): Id of the item associated with the node, or ROOT for the root node.
         parent (object): Reference to the parent node (default is None).
+        counter (int): Initial support of the node (default is 1).
     """
-    def __init__(self, value, parent=None):
+    def __init__(self, value, parent=None, counter: int = 1):
         self.value = value
-        self.children = []
-        self.counter = 1
+        self.children = {} # Children indexed by their value
+        self.counter = counter
         self.parent = parent
         self.node_link = None # Node links for connecting data with the same values. It will help us to explore the FP-Tree transversely
 
     def add_child(self, child):
         """
-        Adds child node to the children list.
+        Adds child node to the children dictionary.
 
         Arguments:
             child (Node class): Child node.
         """
-        self.children.append(child)
+        self.children[child.value] = child
 
-    def count(self):
+    def count(self, amount: int = 1):
         """
         Increases the internal counter of the itemset.
+
+        Arguments:
+            amount (int): Quantity added to the counter (default is 1).
         """
-        self.counter += 1
+        self.counter += amount
 
     def itemset(self):
         """
         Returns the transaction representation of the current itemset.
         """
-        if self.parent is None and self.value != "root":
+        if self.parent is None and self.value != ROOT:
             raise ValueError("No parent itemset provided.")
-        elif self.value == "root":
+        elif self.value == ROOT:
             return []
         else:
             return self.parent.itemset() + [self.value]
@@ -55,7 +68,7 @@ class Node:
             self.value: self.counter,
             "children": []
             }
-        for child in self.children:
+        for child in self.children.values():
             tree["children"].append(child.to_dict())
         return tree
 
@@ -64,16 +77,48 @@ class Node:
         Allows dictionary-like access to child nodes by their value.
 
         Arguments:
-            key (str): Value of the child to consider.
+            key (int): Value of the child to consider.
         """
         if key == self.value:
             return self.to_dict()
-        for child in self.children:
+        for child in self.children.values():
             try:
                 return child[key] # It's the same as "child.__getitem__(key)"
             except KeyError:
                 continue
         raise KeyError(f"No node found with value: {key}")
+
+
+class SlotNode:
+    """
+    Tree node class with the same interface as Node, but declaring its attributes in `__slots__`.
+
+    Instances do not carry a `__dict__`, which noticeably reduces the memory used by large trees
+    built by callers that still need to walk node objects.
+
+    Arguments:
+        value (int): Id of the item associated with the node, or ROOT for the root node.
+        parent (object): Reference to the parent node (default is None).
+        counter (int): Initial support of the node (default is 1).
+    """
+    __slots__ = ("value", "children", "counter", "parent", "node_link")
+
+    __init__ = Node.__init__
+    add_child = Node.add_child
+    count = Node.count
+    itemset = Node.itemset
+    to_dict = Node.to_dict
+    __getitem__ = Node.__getitem__
+
+
+# Values of a binary dataset denoting the presence of an item (True is equal to 1)
+_PRESENT = {1, "1"}
+
+# Node classes available for the object based backends of fp_tree_construction
+NODE_BACKENDS = {
+    "node": Node,
+    "slots": SlotNode,
+}
     
 
 class HeaderTable:
@@ -81,18 +126,36 @@ class HeaderTable:
     Class for representing the header table of the FP-tree.
 
     This HeaderTable contain attributes and methods for tracking nodes with the same
-    values in the FP-tree and linking them with node links.
+    values in the FP-tree and linking them with node links. Besides the first node and the
+    support of each item, the table keeps the last node of each chain and the number of nodes
+    in it, so new links are added in constant time.
 
     Arguments:
-        item_support (dict): Dictionary with the counter of each item in the dataset.
+        item_support (dict): Dictionary with the counter of each item id in the dataset.
+        backend (str): Name of the tree backend whose nodes are linked by this table (default is "node").
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids (default is None).
     """
-    def __init__(self, item_support: dict):
+    def __init__(self, item_support: dict, backend: str = "node", item_dictionary: ItemDictionary = None):
+        self.backend = backend
+        self.item_dictionary = item_dictionary
         self.table = {}
         for item, count in item_support.items():
-            self.table[item] = {
-                "node": None,
-                "count": count
-            }
+            self.add_item(item, count)
+
+    def add_item(self, item, count: int = 0):
+        """
+        Adds an item without nodes at the end of the table.
+
+        Arguments:
+            item (int): Id of the item.
+            count (int): Support of the item (default is 0).
+        """
+        self.table[item] = {
+            "node": None,
+            "count": count,
+            "tail": None,
+            "nodes": 0
+        }
 
     def add_node_link(self, node: Node):
         """
@@ -101,20 +164,20 @@ class HeaderTable:
         Arguments:
             node (Node class): Reference to the node from the Node class.
         """
-        if node.value in self.table and self.table[node.value]["node"] is None:
-            self.table[node.value]["node"] = node
+        entry = self.table[node.value]
+        if entry["node"] is None:
+            entry["node"] = node
         else:
-            next_node = self.table[node.value]["node"]
-            while next_node.node_link is not None:
-                next_node = next_node.node_link
-            next_node.node_link = node
+            entry["tail"].node_link = node
+        entry["tail"] = node
+        entry["nodes"] += 1
 
     def get(self, value):
         """
         Gets the reference to the first appareance with item 'value'.
 
         Arguments:
-            value (str): Value to search in the header table.
+            value (int): Value to search in the header table.
 
         Returns:
             Node class: Reference to the first node in the FP-tree with item
@@ -126,31 +189,68 @@ class HeaderTable:
         """Returns all items in the header table."""
         return self.table
 
+    def prefix_paths(self, value):
+        """
+        Iterates over the prefix paths of the nodes with item `value`, following the node links.
 
-def first_scan(data, header: list = None, minimum_support: int = 1):
+        Arguments:
+            value (int): Value to search in the header table.
+
+        Yields:
+            tuple: The list of items from the root to the node (both excluded) and the node counter.
+        """
+        node = self.table[value]["node"]
+        while node is not None:
+            path = []
+            parent = node.parent
+            while parent.parent is not None:
+                path.append(parent.value)
+                parent = parent.parent
+            path.reverse()
+            yield path, node.counter
+            node = node.node_link
+
+
+def first_scan(data, header: list = None, minimum_support: int = 1, weighted: bool = False, sparse: bool = False,
+               scan_summary: dict = None):
     """
     Applies the first scan to obtain the support of the 1-item frequent itemsets.
 
     Arguments:
         data (list): Dataset with items.
-        header (list): List with the item's names.
+        header (list): List with the item's names. Not used with sparse datasets.
         minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1). 
+        weighted (bool): Whether each transaction is given as a (transaction, count) pair (default=False).
+        sparse (bool): Whether each transaction is given as the list of its items instead of a binary row,
+            so the work is proportional to the number of items present in the transactions (default=False).
+        scan_summary (dict): Dictionary where the summary of the scan is stored, if it is given (see
+            summarize_scan) (default=None).
 
     Returns:
         item_support (dict): Dictionary containing the support of the 1-item itemsets.
         item_order (list): List with the items sorted in descending order of support.
     """
-    if header is None:
+    if header is None and not sparse:
         raise ValueError("Header is missing.")
 
     # Getting item support
     item_support = {}
+    n_transactions = 0
     for transaction in data:
-        for i in range(len(transaction)):
-            if header[i] in item_support:
-                item_support[header[i]] += int(transaction[i])
-            else:
-                item_support[header[i]] = int(transaction[i])
+        # Weighted transactions contribute their count instead of a single occurrence
+        if weighted:
+            transaction, weight = transaction
+        else:
+            weight = 1
+        n_transactions += weight
+        if sparse:
+            for item in set(transaction):
+                item_support[item] = item_support.get(item, 0) + weight
+        else:
+            # Rows shorter or longer than the header only count the values under it
+            for i in range(min(len(transaction), len(header))):
+                if transaction[i] in _PRESENT:
+                    item_support[header[i]] = item_support.get(header[i], 0) + weight
     
     # Filter frequent items
     frequent_items = {item: count for item, count in item_support.items() if count >= minimum_support}
@@ -162,9 +262,32 @@ def first_scan(data, header: list = None, minimum_support: int = 1):
     # Reconstruct filtered item_support dictionary in sorted order
     item_support = {item: frequent_items[item] for item in item_order}
 
+    if scan_summary is not None:
+        scan_summary.update(summarize_scan(n_transactions, item_support))
+
     return item_order, item_support
 
 
+def summarize_scan(n_transactions: int, item_support: dict):
+    """
+    Computes the summary of the first scan of a dataset: its size and density.
+
+    Arguments:
+        n_transactions (int): Number of transactions of the dataset.
+        item_support (dict): Dictionary with the support of each frequent item.
+
+    Returns:
+        dict: Number of transactions, number of frequent items and density, which is the fraction of
+            the cells of the binary matrix of the frequent items that are 1.
+    """
+    cells = n_transactions * len(item_support)
+    return {
+        "transactions": n_transactions,
+        "items": len(item_support),
+        "density": sum(item_support.values()) / cells if cells else 0.0,
+    }
+
+
 def sort_by_support(sample, header, item_order):
     """
     Sort the items in the sample by the specified order.
@@ -185,7 +308,7 @@ def sort_by_support(sample, header, item_order):
     return sorted_sample
     
 
-def explore(sample, header, header_table: HeaderTable, tree: Node = None):
+def explore(sample, header, header_table: HeaderTable, tree: Node = None, count: int = 1):
     """
     Searches the list for similarities with the values in the given tree.  
     If no similarities are found, a new node is created in the tree.
@@ -195,70 +318,254 @@ def explore(sample, header, header_table: HeaderTable, tree: Node = None):
         header (list): A list of strings representing the names of the transaction items.
         header_table (HeaderTable): Header table for tracking nodes with same values.
         tree (Node): The root node of the tree structure to expand (default: None).
+        count (int): Number of times the transaction appears in the dataset (default: 1).
     """
     if tree is None:
         raise(ValueError("No tree has been passed."))
     else:
-        # This process is applied recursively
-        for i in range(len(sample)):
-            if int(sample[i]) == 1:
-                found = False
-                for child in tree.children:
-                    # If a node exists, then the counter is increased and we continue analyzing the transaction
-                    if header[i] == child.value:         
-                        child.count()
-                        explore(sample[i + 1:], header[i + 1:], header_table, tree=child)
-                        found = True
-                        break
-                
-                # If no node has been found, then it is created
-                if not found:
-                    child = Node(header[i], tree)
-                    tree.add_child(child)
-                    header_table.add_node_link(child)
-                    explore(sample[i + 1:], header[i + 1:], header_table, tree=child)
-                    break
-                else:
-                    break
-                
-
-def fp_tree_construction(dataset, minimum_support: int = 1, is_header: bool = True):
+        items = [header[i] for i in range(len(sample)) if int(sample[i]) == 1]
+        insert_transaction(items, header_table, tree, count)
+
+
+def insert_transaction(items, header_table: HeaderTable, tree: Node, count: int = 1):
     """
-    Builds the FP-tree from the input dataset.
+    Inserts a transaction into the tree, walking down from the root in a loop. The nodes
+    that already exist increase their counter, and the missing ones are created.
+
+    Arguments:
+        items (list): Item ids of the transaction, already filtered and sorted in the order of the tree.
+        header_table (HeaderTable): Header table for tracking nodes with same values.
+        tree (Node): The root node of the tree structure to expand.
+        count (int): Number of times the transaction appears in the dataset (default: 1).
+    """
+    node_class = type(tree) # Children share the class of the root
+    node = tree
+    for item in items:
+        child = node.children.get(item)
+        # If a node exists, then the counter is increased and we continue down the transaction
+        if child is not None:
+            child.counter += count
+        # If no node has been found, then it is created
+        else:
+            child = node_class(item, node, count)
+            node.children[item] = child
+            header_table.add_node_link(child)
+        node = child
+
+
+
+def _transactions(dataset, is_header: bool):
+    """
+    Returns an iterator over the transactions of the dataset, skipping the header and the blank rows
+    without copying the data. Both scans read the transactions through it, so they skip the same rows.
+
+    Arguments:
+        dataset (list): Dataset, or any object that can be iterated several times.
+        is_header (bool): Boolean flag indicating whether the dataset includes a header in the first row.
+    """
+    transactions = iter(dataset)
+    if is_header:
+        next(transactions, None)
+    return (row for row in transactions if not is_blank_row(row))
+
+
+def _first_row(rows):
+    """
+    Returns the first element of an iterable, or None if it is empty. Generators are closed afterwards,
+    so the files streamed by them are not left open.
+
+    Arguments:
+        rows (iterable): Dataset or iterator over its transactions.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if hasattr(rows, "close"):
+        rows.close()
+    return first
+
+
+def build_tree(transactions, item_support: dict, backend: str, item_dictionary: ItemDictionary):
+    """
+    Creates the tree and the header table with the given backend and inserts the transactions. This is the second
+    scan of fp_tree_construction, so the output of encode_dataset can be turned into a tree in a separate step.
+
+    Arguments:
+        transactions (iterable): Pairs with the item ids of each transaction, already filtered and
+            sorted in the order of the tree, and the number of times it appears.
+        item_support (dict): Dictionary with the support of each frequent item id, in the order of the tree.
+        backend (str): Storage used for the tree.
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids.
+
+    Returns:
+        fp_tree (Node | SlotNode | ArrayFPTree): The root of the FP-tree.
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-tree.
+    """
+    if backend == "array":
+        fp_tree = ArrayFPTree(len(item_dictionary)) # Tree initilization
+        header_table = ArrayHeaderTable(item_support, fp_tree, item_dictionary) # Header table initilization
+        for items, count in transactions:
+            fp_tree.insert(items, header_table, count)
+        fp_tree.compact()
+    else:
+        fp_tree = NODE_BACKENDS[backend](ROOT) # Tree initilization
+        header_table = HeaderTable(item_support, backend, item_dictionary) # Header table initilization
+        for items, count in transactions:
+            insert_transaction(items, header_table, fp_tree, count)
+
+    return fp_tree, header_table
+
+
+def encode_dataset(dataset, minimum_support: int = 1, is_header: bool = True, weighted: bool = False,
+                   item_dictionary: ItemDictionary = None, canonical: bool = False, scan_summary: dict = None,
+                   sparse: bool = None):
+    """
+    Applies the first scan to the dataset and prepares the second scan, which encodes the items of the
+    transactions and sorts them in the order of the tree.
+
+    The dataset can be in binary format, where each transaction is a row of 0/1 values for the items in the
+    header, or in sparse format, where each transaction is the list of the items it contains. Sparse datasets
+    are encoded directly, without expanding them into binary rows.
 
     Args:
-        dataset (list): A list of transactions, where each transaction is a list of items.
+        dataset (list): A list of transactions, where each transaction is a list of items. Any other object that
+            can be iterated several times, like the file datasets of utils.loaders, is also accepted, as well
+            as a utils.binary_matrix.BinaryMatrix.
         minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1).
         is_header (bool): Boolean flag indicating whether the dataset includes a header in the first row.
+        weighted (bool): Boolean flag indicating whether each transaction is given as a (transaction, count)
+            pair, as in the conditional pattern bases of FP-Growth (default=False).
+        item_dictionary (ItemDictionary): Dictionary of an existing tree. When it is given, the items of the
+            dataset are taken as ids of this dictionary, as in the conditional pattern bases of FP-Growth.
+            Otherwise, a new dictionary is created from the item names after the first scan (default=None).
+        canonical (bool): Boolean flag indicating whether the items are sorted by id, instead of by their support
+            in this dataset. It only makes a difference when `item_dictionary` is given (default=False).
+        scan_summary (dict): Dictionary where the summary of the first scan is stored, if it is
+            given (see summarize_scan) (default=None).
+        sparse (bool): Whether the transactions are lists of items (True) or binary rows (False). If it is None,
+            the `sparse` attribute of the dataset is used, like the one of utils.loaders.BasketTransactions, and
+            without it the format is guessed from the first transaction (default=None).
 
     Returns:
-        fp_tree (Node): The root of the FP-tree representing the itemsets in a tree structure.
-        header_table (HeaderTable): The header table for tracking nodes with the same item.
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids.
+        item_support (dict): Dictionary with the support of each frequent item id, in the order of the tree.
+        transactions (iterator): Second scan of the dataset, which yields pairs with the item ids of each
+            transaction, filtered and sorted in the order of the tree, and the number of times it appears.
     """
-    # Split if header flag is True
+    # Binary matrices compute the first scan and sort the transactions in bulk with NumPy
+    if isinstance(dataset, BinaryMatrix):
+        item_order, item_support = dataset.first_scan(minimum_support)
+        if scan_summary is not None:
+            scan_summary.update(summarize_scan(len(dataset), item_support))
+        item_dictionary = ItemDictionary(item_order)
+        item_support = {item_dictionary.encode(item): count for item, count in item_support.items()}
+        return item_dictionary, item_support, dataset.sorted_transactions(item_order)
+
+    # Split if header flag is True. The dataset is only iterated, so it can also be a file that is streamed
+    # from disk in each scan, like the ones of utils.loaders
+    header = None
     if is_header:
-        header = dataset[0]
-        data = dataset[1:]
-    else:
-        data = dataset
-        
-    # Check if the data set is in transaction or binary format and applies a transformaction in the first case
-    target_list = ["1", "0", 1, 0, True, False]
-    if isinstance(data, list) and all(isinstance(transaction, list) for transaction in data):
-        if any(item in target_list for item in data[0]):
-            pass
-        else:
-            data, header = transaction_to_binary(data)
+        header = _first_row(dataset)
+
+    # Check if the data set is in sparse or binary format, unless it is known.
+    # Datasets of encoded items are always sparse, since their ids can be confused with binary values
+    if item_dictionary is not None:
+        sparse = True
+    elif sparse is None:
+        sparse = getattr(dataset, "sparse", None)
+    if sparse is None:
+        target_list = ["1", "0", 1, 0, True, False]
+        sample = _first_row(_transactions(dataset, is_header))
+        if weighted and sample is not None:
+            sample = sample[0]
+        sparse = not (sample and any(item in target_list for item in sample))
     
     # First scan
-    item_order, item_support = first_scan(data, header, minimum_support)
+    item_order, item_support = first_scan(_transactions(dataset, is_header), header, minimum_support, weighted, sparse,
+                                          scan_summary)
+
+    # Item encoding. The items of a new tree are encoded as their rank in descending order of support
+    encoded = item_dictionary is not None
+    if not encoded:
+        item_dictionary = ItemDictionary(item_order)
+        item_order = [item_dictionary.encode(item) for item in item_order]
+        item_support = {item_dictionary.encode(item): count for item, count in item_support.items()}
+    elif canonical:
+        item_order = sorted(item_order)
+        item_support = {item: item_support[item] for item in item_order}
+
+    if sparse:
+        # Rank of each frequent item in the order of the tree, for sorting the transactions of encoded items
+        rank = {item: i for i, item in enumerate(item_order)}
+    else:
+        # Column of each frequent item, in descending order of support. Reading the columns in this order
+        # gives the items of every transaction already filtered and sorted
+        column = {item_dictionary.encode(item): i for i, item in enumerate(header) if item in item_dictionary}
+        columns = [(item, column[item]) for item in item_order]
+
+    # Transactions of the second scan as item ids, filtered and sorted in the order of the tree
+    def sorted_transactions():
+        for sample in _transactions(dataset, is_header):
+            if weighted:
+                sample, count = sample
+            else:
+                count = 1
+            if not sparse:
+                items = [item for item, i in columns if i < len(sample) and sample[i] in _PRESENT]
+            elif encoded:
+                items = sorted([item for item in sample if item in rank], key=rank.__getitem__)
+            else:
+                items = item_dictionary.encode_transaction(sample)
+            yield items, count
 
-    # Second scan
-    fp_tree = Node("root") # Tree initilization
-    header_table = HeaderTable(item_support) # Header table initilization
-    
-    for sample in data:
-        sorted_sample = sort_by_support(sample, header, item_order)
-        explore(sorted_sample, item_order, header_table, fp_tree)
+    return item_dictionary, item_support, sorted_transactions()
+
+
+def fp_tree_construction(dataset, minimum_support: int = 1, is_header: bool = True, weighted: bool = False,
+                         backend: str = "node", item_dictionary: ItemDictionary = None, canonical: bool = False,
+                         stats=None, sparse: bool = None, scan_summary: dict = None):
+    """
+    Builds the FP-tree from the input dataset.
+
+    The dataset can be in binary format, where each transaction is a row of 0/1 values for the items in the
+    header, or in sparse format, where each transaction is the list of the items it contains. Sparse datasets
+    are inserted directly, without expanding them into binary rows.
+
+    Args:
+        dataset (list): A list of transactions, where each transaction is a list of items. Any other object that
+            can be iterated several times, like the file datasets of utils.loaders, is also accepted, as well
+            as a utils.binary_matrix.BinaryMatrix.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1).
+        is_header (bool): Boolean flag indicating whether the dataset includes a header in the first row.
+        weighted (bool): Boolean flag indicating whether each transaction is given as a (transaction, count)
+            pair, as in the conditional pattern bases of FP-Growth (default=False).
+        backend (str): Storage used for the tree. "node" builds Node objects, "slots" builds SlotNode objects and
+            "array" stores the whole tree in parallel typed arrays (default="node").
+        item_dictionary (ItemDictionary): Dictionary of an existing tree. When it is given, the items of the
+            dataset are taken as ids of this dictionary, as in the conditional pattern bases of FP-Growth.
+            Otherwise, a new dictionary is created from the item names after the first scan (default=None).
+        canonical (bool): Boolean flag indicating whether the items are sorted by id, instead of by their support
+            in this dataset. It only makes a difference when `item_dictionary` is given (default=False).
+        stats (MiningStats): Collector of the time of both scans and the size of the tree, or None (default=None).
+        sparse (bool): Whether the transactions are lists of items (True) or binary rows (False). It is
+            guessed from the dataset if it is None (see encode_dataset) (default=None).
+        scan_summary (dict): Dictionary where the summary of the first scan, like the number of
+            transactions, is stored, if it is given (see summarize_scan) (default=None).
+
+    Returns:
+        fp_tree (Node | SlotNode | ArrayFPTree): The root of the FP-tree representing the itemsets in a tree structure.
+        header_table (HeaderTable | ArrayHeaderTable): The header table for tracking nodes with the same item.
+    """
+    if backend != "array" and backend not in NODE_BACKENDS:
+        raise ValueError(f"Unknown FP-tree backend: {backend}")
+
+    # First scan. The phases are only timed if the statistics are requested
+    with stats.phase("first_scan") if stats is not None else nullcontext():
+        item_dictionary, item_support, transactions = encode_dataset(dataset, minimum_support, is_header, weighted,
+                                                                     item_dictionary, canonical, scan_summary, sparse)
 
-    return fp_tree, header_table
\ No newline at end of file
+    # Second scan
+    with stats.phase("build") if stats is not None else nullcontext():
+        fp_tree, header_table = build_tree(transactions, item_support, backend, item_dictionary)
+    if stats is not None:
+        stats.record_tree(header_table)
+    return fp_tree, header_table
@@ -0,0 +1,170 @@
+"""
+Functions for storing FP-trees in a binary file, which can be opened again by memory-mapping it.
+
+The file holds the node arrays of an ArrayFPTree, the header table and the item dictionary:
+
+- A fixed header with the magic bytes, the byte order, the sizes of the sections and the minimum support
+  used for building the tree.
+- The arrays of 8 byte values: the counts of the nodes and the supports of the header table entries.
+- The arrays of 4 byte values: item, parent, node link, first child and next sibling of the nodes, followed
+  by item, first node, last node and number of nodes of the header table entries.
+
+The 8 byte arrays go first, so every array is aligned to the size of its values.
+- The names of the item dictionary, as JSON.
+"""
+
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from algorithms.array_fp_tree import ArrayFPTree, ArrayHeaderTable
+from algorithms.item_dictionary import ItemDictionary
+
+
+# First bytes of every tree file
+TREE_MAGIC = b"FPTREE01"
+
+# Magic bytes, byte order, number of nodes, number of header table entries, size of the names and minimum support
+_HEADER = struct.Struct("<8s8sqqqq")
+
+# Node arrays after the counts, in the order of the file
+_NODE_ARRAYS = ("item", "parent", "node_link", "first_child", "next_sibling")
+
+# Header table arrays after the supports, in the order of the file
+_TABLE_ARRAYS = ("item", "node", "tail", "nodes")
+
+
+def to_array_tree(fp_tree, header_table):
+    """
+    Copies a tree of Node or SlotNode objects into an ArrayFPTree, keeping the order of the node links.
+
+    Arguments:
+        fp_tree (Node | SlotNode | ArrayFPTree): The root of the FP-tree.
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-tree.
+
+    Returns:
+        fp_tree (ArrayFPTree): The tree stored in arrays.
+        header_table (ArrayHeaderTable): The header table of the new tree.
+    """
+    if isinstance(fp_tree, ArrayFPTree):
+        return fp_tree, header_table
+
+    item_dictionary = header_table.item_dictionary
+    array_tree = ArrayFPTree(len(item_dictionary))
+    array_tree.compact()
+    index = {}
+    stack = [(fp_tree, 0)]
+    while stack:
+        node, parent = stack.pop()
+        for child in node.children.values():
+            index[id(child)] = array_tree.add_node(child.value, parent, child.counter)
+            stack.append((child, index[id(child)]))
+
+    item_support = {item: entry["count"] for item, entry in header_table.table.items()}
+    array_header_table = ArrayHeaderTable(item_support, array_tree, item_dictionary)
+    for item in header_table.table:
+        node = header_table.table[item]["node"]
+        while node is not None:
+            array_header_table.add_node_link(index[id(node)])
+            node = node.node_link
+
+    return array_tree, array_header_table
+
+
+def save_fp_tree(file_path: str, fp_tree, header_table, minimum_support: int = 1):
+    """
+    Writes an FP-tree, its header table and its item dictionary to a binary file.
+
+    Arguments:
+        file_path (str): Path of the file.
+        fp_tree (Node | SlotNode | ArrayFPTree): The root of the FP-tree. Trees of nodes are stored as arrays.
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-tree.
+        minimum_support (int): The minimum support used for building the tree, below which it cannot be
+            mined (default=1).
+    """
+    fp_tree, header_table = to_array_tree(fp_tree, header_table)
+    names = json.dumps(header_table.item_dictionary.names).encode("utf-8")
+
+    table = header_table.table
+    table_arrays = {
+        "item": array("i", table),
+        "node": array("i", [-1 if entry["node"] is None else entry["node"] for entry in table.values()]),
+        "tail": array("i", [-1 if entry["tail"] is None else entry["tail"] for entry in table.values()]),
+        "nodes": array("i", [entry["nodes"] for entry in table.values()]),
+    }
+    supports = array("q", [entry["count"] for entry in table.values()])
+
+    with open(file_path, mode="wb") as file:
+        file.write(_HEADER.pack(TREE_MAGIC, sys.byteorder.encode("ascii"), len(fp_tree), len(table), len(names),
+                                minimum_support))
+        file.write(memoryview(fp_tree.count).cast("B"))
+        file.write(memoryview(supports).cast("B"))
+        for name in _NODE_ARRAYS:
+            file.write(memoryview(getattr(fp_tree, name)).cast("B"))
+        for name in _TABLE_ARRAYS:
+            file.write(memoryview(table_arrays[name]).cast("B"))
+        file.write(names)
+
+
+def load_fp_tree(file_path: str, memory_map: bool = True):
+    """
+    Opens an FP-tree stored with save_fp_tree.
+
+    With `memory_map`, the node arrays of the tree are memoryviews over the memory-mapped file, so nothing
+    is parsed or copied until the mining reads it, and the pages are shared by all the processes that open
+    the same file. Such trees are read-only. Otherwise, the arrays are read into memory.
+
+    Arguments:
+        file_path (str): Path of the file.
+        memory_map (bool): Whether to memory-map the node arrays instead of reading them (default=True).
+
+    Returns:
+        fp_tree (ArrayFPTree): The root of the FP-tree.
+        header_table (ArrayHeaderTable): The header table of the FP-tree.
+        minimum_support (int): The minimum support used for building the tree.
+    """
+    with open(file_path, mode="rb") as file:
+        if memory_map:
+            data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = memoryview(file.read())
+
+    magic, byteorder, n_nodes, n_entries, names_size, minimum_support = _HEADER.unpack_from(data)
+    if magic != TREE_MAGIC:
+        raise ValueError(f"{file_path} is not an FP-tree file.")
+    if byteorder.rstrip(b"\0").decode("ascii") != sys.byteorder:
+        raise ValueError(f"{file_path} was written on a machine with a different byte order.")
+
+    offset = _HEADER.size
+
+    def section(typecode: str, length: int):
+        nonlocal offset
+        size = length * array(typecode).itemsize
+        view = data[offset:offset + size].cast(typecode)
+        offset += size
+        return view if memory_map else array(typecode, view)
+
+    fp_tree = ArrayFPTree(0)
+    fp_tree.compact()
+    fp_tree.count = section("q", n_nodes)
+    supports = section("q", n_entries)
+    for name in _NODE_ARRAYS:
+        setattr(fp_tree, name, section("i", n_nodes))
+    table_arrays = {name: section("i", n_entries) for name in _TABLE_ARRAYS}
+    names = json.loads(bytes(data[offset:offset + names_size]).decode("utf-8"))
+
+    item_dictionary = ItemDictionary(names)
+    fp_tree.n_items = len(item_dictionary)
+    header_table = ArrayHeaderTable({}, fp_tree, item_dictionary)
+    for i, item in enumerate(table_arrays["item"]):
+        header_table.add_item(item, supports[i])
+        entry = header_table.table[item]
+        if table_arrays["node"][i] != -1:
+            entry["node"] = table_arrays["node"][i]
+            entry["tail"] = table_arrays["tail"][i]
+        entry["nodes"] = table_arrays["nodes"][i]
+
+    return fp_tree, header_table, minimum_support
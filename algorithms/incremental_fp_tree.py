@@ -0,0 +1,225 @@
+"""
+Functions for updating an existing FP-tree with new batches of transactions, without rebuilding it.
+
+The items of the tree keep their ids when it is updated, and the new items get the next free ids. The
+order of the tree is the order of the items in its header table, which is kept sorted by support (or
+fixed, in canonical order), so after an update the ids are no longer the ranks of the items.
+"""
+
+
+from algorithms.array_fp_tree import ArrayHeaderTable
+from algorithms.fp_tree_construction import _PRESENT, _first_row, _transactions, HeaderTable, insert_transaction
+
+
+# Orders supported by update_fp_tree
+UPDATE_ORDERS = ("support", "canonical")
+
+
+def _batch_transactions(batch, is_header: bool, weighted: bool):
+    """
+    Reads a batch of transactions as lists of item names.
+
+    Arguments:
+        batch (list): Binary rows with a header row, or lists of item names without it.
+        is_header (bool): Boolean flag indicating whether the batch includes a header in the first row,
+            in which case the transactions are binary rows.
+        weighted (bool): Boolean flag indicating whether each transaction is given as a (transaction, count) pair.
+
+    Returns:
+        list: List of (item names, count) pairs.
+    """
+    header = _first_row(batch) if is_header else None
+    transactions = []
+    for sample in _transactions(batch, is_header):
+        if weighted:
+            sample, count = sample
+        else:
+            count = 1
+        if header is not None:
+            sample = [item for item, value in zip(header, sample) if value in _PRESENT]
+        transactions.append((sample, count))
+    return transactions
+
+
+def _affected_items(old_order: list, new_rank: dict):
+    """
+    Finds the items whose order relative to some other item changes.
+
+    An item is affected if an item before it in the old order goes after it in the new order, or the other
+    way around. The first case is detected with the maximum new rank of the items before it, and the second
+    one with the minimum new rank of the items after it.
+
+    Arguments:
+        old_order (list): Item ids in the old order of the tree.
+        new_rank (dict): Position of each item id in the new order of the tree.
+
+    Returns:
+        set: The affected item ids.
+    """
+    ranks = [new_rank[item] for item in old_order]
+    suffix_min = ranks[:]
+    for i in range(len(ranks) - 2, -1, -1):
+        suffix_min[i] = min(ranks[i], suffix_min[i + 1])
+
+    affected = set()
+    prefix_max = -1
+    for i, (item, rank) in enumerate(zip(old_order, ranks)):
+        if prefix_max > rank or (i + 1 < len(ranks) and suffix_min[i + 1] < rank):
+            affected.add(item)
+        prefix_max = max(prefix_max, rank)
+    return affected
+
+
+def _subtree_transactions(top, removed: list):
+    """
+    Converts the subtree of a node into the weighted transactions that it holds, starting at the node.
+
+    Arguments:
+        top (Node | SlotNode): Root of the subtree.
+        removed (list): List of the nodes of the subtree, which is updated.
+
+    Returns:
+        list: List of (items, count) pairs, with the number of transactions ending at each node.
+    """
+    transactions = []
+    stack = [(top, [top.value])]
+    while stack:
+        node, path = stack.pop()
+        removed.append(node)
+        ending = node.counter - sum(child.counter for child in node.children.values())
+        if ending > 0:
+            transactions.append((path, ending))
+        for child in node.children.values():
+            stack.append((child, path + [child.value]))
+    return transactions
+
+
+def _restructure(header_table: HeaderTable, affected: set, new_rank: dict):
+    """
+    Sorts again the branches of the tree that contain affected items.
+
+    The items above the first affected item of a path keep their relative order with every other item, so
+    only the subtrees hanging from the topmost affected nodes are removed and their transactions inserted
+    again, in the new order, under the same parent. The removed nodes are unlinked from the node links.
+
+    Arguments:
+        header_table (HeaderTable): The header table of the tree.
+        affected (set): Item ids whose relative order changes.
+        new_rank (dict): Position of each item id in the new order of the tree.
+    """
+    # The topmost affected node of each path is found climbing from the nodes of the affected items
+    tops = {}
+    for item in affected:
+        node = header_table.table[item]["node"]
+        while node is not None:
+            top = node
+            parent = node.parent
+            while parent.parent is not None:
+                if parent.value in affected:
+                    top = parent
+                parent = parent.parent
+            tops[id(top)] = top
+            node = node.node_link
+
+    removed = []
+    reinserted = []
+    for top in tops.values():
+        reinserted.append((top.parent, _subtree_transactions(top, removed)))
+        del top.parent.children[top.value]
+
+    # The chains of the removed nodes are linked again without them
+    removed_ids = {id(node) for node in removed}
+    for item in {node.value for node in removed}:
+        entry = header_table.table[item]
+        node = entry["node"]
+        entry["node"], entry["tail"], entry["nodes"] = None, None, 0
+        while node is not None:
+            next_node = node.node_link
+            node.node_link = None
+            if id(node) not in removed_ids:
+                header_table.add_node_link(node)
+            node = next_node
+
+    for parent, transactions in reinserted:
+        for items, count in transactions:
+            items.sort(key=new_rank.__getitem__)
+            insert_transaction(items, header_table, parent, count)
+
+
+def update_fp_tree(fp_tree, header_table, batch, is_header: bool = False, weighted: bool = False,
+                   order: str = "support"):
+    """
+    Inserts a new batch of transactions into an existing FP-tree and its header table.
+
+    The supports of the items are updated with the batch, and the new items are added to the item dictionary
+    of the tree. With the "support" order, the items are sorted again by support, and only the branches where
+    two items swap their order are restructured. With the "canonical" order (as in CanTree), the order of the
+    items never changes and new items go after the existing ones, so the batch is just inserted. The time of
+    the update depends on the size of the batch and of the restructured branches, not on the whole tree.
+
+    The tree must be built with a minimum support of 1, since the items pruned from it cannot be recovered.
+    The minimum support is then given to fp_growth, which can run on the updated tree right away.
+
+    Arguments:
+        fp_tree (Node | SlotNode | ArrayFPTree): The root of the FP-tree, which is updated.
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-tree, which is updated.
+        batch (list): New transactions, as binary rows with a header row or as lists of item names.
+        is_header (bool): Boolean flag indicating whether the batch includes a header in the first row (default=False).
+        weighted (bool): Boolean flag indicating whether each transaction is given as a (transaction, count)
+            pair (default=False).
+        order (str): "support" for keeping the items sorted by support, or "canonical" for keeping the
+            order of the tree fixed (default="support").
+
+    Returns:
+        fp_tree (Node | SlotNode | ArrayFPTree): The root of the updated FP-tree.
+        header_table (HeaderTable | ArrayHeaderTable): The updated header table.
+    """
+    if order not in UPDATE_ORDERS:
+        raise ValueError(f"Unknown order of the tree: {order}")
+    is_array = isinstance(header_table, ArrayHeaderTable)
+    if is_array and order == "support":
+        raise ValueError("Array trees can only be updated in canonical order.")
+
+    transactions = _batch_transactions(batch, is_header, weighted)
+
+    # First scan of the batch, adding the new items at the end of the order
+    item_dictionary = header_table.item_dictionary
+    table = header_table.table
+    encoded = []
+    for names, count in transactions:
+        items = set()
+        for name in names:
+            if name not in item_dictionary:
+                header_table.add_item(item_dictionary.add(name))
+            items.add(item_dictionary.encode(name))
+        for item in items:
+            table[item]["count"] += count
+        encoded.append((items, count))
+
+    if is_array and fp_tree.n_items != len(item_dictionary):
+        # The children index is keyed with the number of items, so it is rebuilt on the next insertion
+        fp_tree.n_items = len(item_dictionary)
+        fp_tree.compact()
+
+    old_order = list(table)
+    if order == "support":
+        new_order = sorted(old_order, key=lambda item: table[item]["count"], reverse=True)
+        if new_order != old_order:
+            new_rank = {item: i for i, item in enumerate(new_order)}
+            # Items without nodes, like the new ones, do not change any branch
+            affected = _affected_items([item for item in old_order if table[item]["node"] is not None], new_rank)
+            if affected:
+                _restructure(header_table, affected, new_rank)
+            header_table.table = {item: table[item] for item in new_order}
+            old_order = new_order
+
+    # Second scan of the batch
+    rank = {item: i for i, item in enumerate(old_order)}
+    for items, count in encoded:
+        items = sorted(items, key=rank.__getitem__)
+        if is_array:
+            fp_tree.insert(items, header_table, count)
+        else:
+            insert_transaction(items, header_table, fp_tree, count)
+
+    return fp_tree, header_table
@@ -0,0 +1,98 @@
+"""
+Class for encoding the item names as dense integer ids.
+"""
+
+
+class ItemDictionary:
+    """
+    Dictionary mapping item names to dense integer ids.
+
+    The ids are the ranks of the items in descending order of support, so sorting a transaction
+    by id sorts it in the order of the FP-tree. All the mining algorithms work with the ids, and
+    the names are only recovered when the results are shown.
+
+    Arguments:
+        item_order (list): List with the item names sorted in descending order of support.
+    """
+    def __init__(self, item_order: list):
+        self.names = list(item_order)
+        self.ids = {item: i for i, item in enumerate(self.names)}
+
+    def __len__(self):
+        """Returns the number of items in the dictionary."""
+        return len(self.names)
+
+    def __contains__(self, item):
+        """Checks whether an item name is in the dictionary."""
+        return item in self.ids
+
+    def add(self, item):
+        """
+        Adds a new item name at the end of the dictionary, as done by the incremental updates of a tree.
+
+        Arguments:
+            item (str): Name of the item.
+
+        Returns:
+            int: Id of the new item.
+        """
+        item_id = len(self.names)
+        self.names.append(item)
+        self.ids[item] = item_id
+        return item_id
+
+    def encode(self, item):
+        """
+        Returns the id of an item name.
+
+        Arguments:
+            item (str): Name of the item.
+        """
+        return self.ids[item]
+
+    def decode(self, item_id: int):
+        """
+        Returns the name of an item id.
+
+        Arguments:
+            item_id (int): Id of the item.
+        """
+        return self.names[item_id]
+
+    def encode_transaction(self, transaction):
+        """
+        Encodes a transaction given as a list of item names, discarding the unknown items.
+
+        Arguments:
+            transaction (list): Names of the items in the transaction.
+
+        Returns:
+            list: Ids of the known items, sorted in descending order of support.
+        """
+        ids = self.ids
+        return sorted({ids[item] for item in transaction if item in ids})
+
+    def decode_itemset(self, itemset):
+        """
+        Decodes an itemset given as a sequence of item ids.
+
+        Arguments:
+            itemset (tuple): Ids of the items.
+
+        Returns:
+            tuple: Names of the items.
+        """
+        names = self.names
+        return tuple(names[item] for item in itemset)
+
+    def decode_itemsets(self, itemsets: dict):
+        """
+        Decodes the keys of a dictionary of itemsets, like the ones returned by fp_growth.
+
+        Arguments:
+            itemsets (dict): Dictionary with itemsets of item ids as keys.
+
+        Returns:
+            dict: Dictionary with itemsets of item names as keys and the same values.
+        """
+        return {self.decode_itemset(itemset): value for itemset, value in itemsets.items()}
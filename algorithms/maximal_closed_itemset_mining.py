@@ -3,6 +3,115 @@ Methods for finding the maximal and closed itemsets within a tree structure.
 """
 
 
+class SubsetIndex:
+    """
+    Index of itemsets for checking whether an itemset is a subset of any of them.
+
+    Every indexed itemset gets a position, and each item keeps a bitset (stored as a Python int) with the
+    positions of the itemsets that contain it. The supersets of an itemset are then the intersection of the
+    bitsets of its items, which is computed with a few big integer ANDs instead of one comparison per itemset.
+    """
+    def __init__(self):
+        self.bitsets = {}
+        self.size = 0
+
+    def __len__(self):
+        """Returns the number of indexed itemsets."""
+        return self.size
+
+    def add(self, itemset):
+        """
+        Adds an itemset to the index.
+
+        Arguments:
+            itemset (tuple): Items of the itemset.
+        """
+        bit = 1 << self.size
+        for item in itemset:
+            self.bitsets[item] = self.bitsets.get(item, 0) | bit
+        self.size += 1
+
+    def update(self, itemsets):
+        """
+        Adds several itemsets to the index, building the new bits of each item at once.
+
+        Arguments:
+            itemsets (iterable): Itemsets to add.
+        """
+        positions = {}
+        for itemset in itemsets:
+            for item in itemset:
+                positions.setdefault(item, []).append(self.size)
+            self.size += 1
+
+        for item, item_positions in positions.items():
+            bits = bytearray(item_positions[-1] // 8 + 1)
+            for position in item_positions:
+                bits[position >> 3] |= 1 << (position & 7)
+            self.bitsets[item] = self.bitsets.get(item, 0) | int.from_bytes(bits, "little")
+
+    def supersets(self, itemset):
+        """
+        Finds the indexed itemsets that contain the given one.
+
+        Arguments:
+            itemset (tuple): Items of the itemset.
+
+        Returns:
+            int: Bitset with the positions of the indexed supersets.
+        """
+        bitsets = [self.bitsets.get(item, 0) for item in itemset]
+        if not bitsets:
+            # Every indexed itemset contains the empty one
+            return (1 << self.size) - 1
+
+        # Starting from the shortest bitset, every AND is bounded by its length instead of the size of the index
+        mask = min(bitsets, key=int.bit_length)
+        for bits in bitsets:
+            mask &= bits
+            if not mask:
+                break
+        return mask
+
+    def has_superset(self, itemset):
+        """
+        Checks whether the given itemset is a subset of any indexed itemset.
+
+        Arguments:
+            itemset (tuple): Items of the itemset.
+        """
+        return self.supersets(itemset) != 0
+
+
+def _maximal_elements(itemsets):
+    """
+    Finds the itemsets that are not a proper subset of any other itemset of the collection.
+
+    The itemsets are checked from the largest to the smallest against an index of the ones already
+    found. If an itemset has a proper superset, one of the found itemsets contains it, since they are
+    the largest ones containing each larger itemset, so only those need to be indexed.
+
+    Arguments:
+        itemsets (iterable): Itemsets to check.
+
+    Returns:
+        set: The itemsets without proper supersets.
+    """
+    by_length = {}
+    for itemset in itemsets:
+        by_length.setdefault(len(itemset), []).append(itemset)
+
+    index = SubsetIndex()
+    maximal = set()
+    for length in sorted(by_length, reverse=True):
+        # Itemsets of the same length cannot be proper supersets of each other
+        found = [itemset for itemset in by_length[length] if not index.has_superset(itemset)]
+        index.update(found)
+        maximal.update(found)
+
+    return maximal
+
+
 def sort_frequent_itemsets(freq_itemsets: dict):
     """
     Sorts the frequent itemsets dictionary lexicographically.
@@ -26,6 +135,9 @@ def find_closed_itemsets(freq_itemsets: dict, order: bool = True):
     """
     Finds the closed frequent itemsets in the specified tree.
 
+    Only the supersets with the same support matter, so the itemsets are grouped by support and
+    the closedness of each one is checked inside its group with a SubsetIndex.
+
     Arguments:
         freq_itemsets (dict): A dictionary containing frequent itemsets and their respective support.
         order (bool): Flag indicating whether to order the itemsets.
@@ -35,19 +147,20 @@ def find_closed_itemsets(freq_itemsets: dict, order: bool = True):
     """
     if order:
         sorted_frequent_itemsets = sort_frequent_itemsets(freq_itemsets)
+    else:
+        sorted_frequent_itemsets = freq_itemsets
 
-    closed_itemsets = {}
+    # For each itemset in the frequent itemsets we check if there is a superset with the same support
+    support_groups = {}
     for (itemset, support) in sorted_frequent_itemsets.items():
-        is_closed = True
-        # For each itemset in the frequent itemsets we check if there is a superset with the same support
-        for (itemset2, support2) in sorted_frequent_itemsets.items():
-            if set(itemset) < set(itemset2) and support == support2: # The comparison must be made with sets, as lists have order
-                is_closed = False
-                break
+        support_groups.setdefault(support, []).append(itemset)
+
+    # If no such superset is found, then it is closed
+    closed = set()
+    for itemsets in support_groups.values():
+        closed.update(_maximal_elements(itemsets))
 
-        # If the previous condition is not found, then it is closed
-        if is_closed:
-            closed_itemsets[itemset] = support
+    closed_itemsets = {itemset: support for (itemset, support) in sorted_frequent_itemsets.items() if itemset in closed}
 
     return closed_itemsets
 
@@ -65,18 +178,13 @@ def find_maximal_itemsets(freq_itemsets: dict, order: bool = True):
     """
     if order:
         sorted_frequent_itemsets = sort_frequent_itemsets(freq_itemsets)
+    else:
+        sorted_frequent_itemsets = freq_itemsets
 
-    maximal_itemsets = {}
-    for (itemset, support) in sorted_frequent_itemsets.items():
-        is_maximal = True
-        # For each itemset in the frequent itemsets we check if there is a superset that is frequent
-        for (itemset2, _) in sorted_frequent_itemsets.items():
-            if set(itemset) < set(itemset2): # Now the support condition is not necessary
-                is_maximal = False
-                break
+    # For each itemset in the frequent itemsets we check if there is a superset that is frequent
+    maximal = _maximal_elements(sorted_frequent_itemsets)
 
-        if is_maximal:
-            maximal_itemsets[itemset] = support
+    maximal_itemsets = {itemset: support for (itemset, support) in sorted_frequent_itemsets.items() if itemset in maximal}
 
     return maximal_itemsets
 
@@ -94,17 +202,9 @@ def find_closed_maximal(freq_itemsets: dict, order: bool = True):
         closed, maximal (tuple): A tuple containing two lists — the closed itemsets and the maximal itemsets.
     """
     closed_itemsets = find_closed_itemsets(freq_itemsets, order)
-    
-    maximal_itemsets = {}
-    for (itemset, support) in closed_itemsets.items():
-        is_maximal = True
-        # The process is similar as the one in find_maximal_itemsets, but only checking the closed itemsets, since
-        # the maximal are a subset them
-        for (itemset2, _) in closed_itemsets.items():
-            if set(itemset) < set(itemset2):
-                is_maximal = False
-        
-        if is_maximal:
-            maximal_itemsets[itemset] = support
-
-    return closed_itemsets, maximal_itemsets
\ No newline at end of file
+
+    # The process is similar as the one in find_maximal_itemsets, but only checking the closed itemsets, since
+    # the maximal are a subset them
+    maximal_itemsets = find_maximal_itemsets(closed_itemsets, order=False)
+
+    return closed_itemsets, maximal_itemsets
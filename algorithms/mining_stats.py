@@ -0,0 +1,126 @@
+"""
+Class for collecting statistics of the construction and the mining of FP-trees, for finding the slow parts of a run.
+"""
+
+
+import json
+import time
+from contextlib import contextmanager
+
+
+class MiningStats:
+    """
+    Collector of the statistics of a mining run. It is passed as the optional `stats` argument of
+    fp_tree_construction and fp_growth, which skip all the bookkeeping when it is None.
+
+    The nodes of each tree and the lengths of its node-link chains are read from the number of nodes of each
+    item, which the header table already keeps, so the insertion of the transactions is not slowed down.
+
+    The time of the phases is measured in two ways: `phase` times a block, and adds up if the same phase
+    runs several times, as the conditional pattern bases do, while `lap` closes a phase that started when
+    the previous one ended, which is convenient for timing the steps of a script.
+
+    Attributes:
+        nodes_created (int): Number of nodes of all the trees built, including the conditional ones.
+        node_link_walks (int): Number of node-link chains followed for collecting conditional pattern bases.
+        node_link_nodes (int): Number of nodes visited following those chains.
+        max_node_link_chain (int): Length of the longest node-link chain of any tree.
+        conditional_trees (int): Number of conditional trees built.
+        conditional_tree_nodes (int): Number of nodes of all the conditional trees.
+        max_conditional_tree_nodes (int): Number of nodes of the largest conditional tree.
+        max_depth (int): Maximum depth of the recursion, which is the length of the longest suffix mined.
+        itemsets (int): Number of itemsets emitted.
+        phases (dict): Wall time of each phase in seconds.
+    """
+    def __init__(self):
+        self.nodes_created = 0
+        self.node_link_walks = 0
+        self.node_link_nodes = 0
+        self.max_node_link_chain = 0
+        self.conditional_trees = 0
+        self.conditional_tree_nodes = 0
+        self.max_conditional_tree_nodes = 0
+        self.max_depth = 0
+        self.itemsets = 0
+        self.phases = {}
+        self._lap_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Times the enclosed block, adding its wall time to the phase `name`.
+
+        Arguments:
+            name (str): Name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def lap(self, name: str):
+        """
+        Adds the wall time since the previous lap (or since the collector was created) to the phase `name`.
+
+        Arguments:
+            name (str): Name of the phase.
+        """
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._lap_start
+        self._lap_start = now
+
+    def record_tree(self, header_table, conditional: bool = False):
+        """
+        Records the nodes and the node-link chains of a tree that has just been built.
+
+        Arguments:
+            header_table (HeaderTable | ArrayHeaderTable): The header table of the tree.
+            conditional (bool): Whether it is a conditional tree of FP-Growth (default=False).
+        """
+        chains = [entry["nodes"] for entry in header_table.table.values()]
+        nodes = sum(chains)
+        self.nodes_created += nodes
+        self.max_node_link_chain = max(self.max_node_link_chain, max(chains, default=0))
+        if conditional:
+            self.conditional_trees += 1
+            self.conditional_tree_nodes += nodes
+            self.max_conditional_tree_nodes = max(self.max_conditional_tree_nodes, nodes)
+
+    def record_walk(self, length: int):
+        """
+        Records that a node-link chain was followed.
+
+        Arguments:
+            length (int): Number of nodes of the chain.
+        """
+        self.node_link_walks += 1
+        self.node_link_nodes += length
+
+    def record_itemset(self, length: int):
+        """
+        Records an emitted itemset.
+
+        Arguments:
+            length (int): Number of items of the itemset, which is the depth of the recursion that found it.
+        """
+        self.itemsets += 1
+        if length > self.max_depth:
+            self.max_depth = length
+
+    def to_dict(self):
+        """Returns the statistics as a dictionary that can be serialized as JSON."""
+        counters = {name: value for name, value in vars(self).items() if not name.startswith("_") and name != "phases"}
+        counters["mean_node_link_chain"] = self.node_link_nodes / self.node_link_walks if self.node_link_walks else 0.0
+        counters["phases"] = dict(self.phases)
+        return counters
+
+    def dump(self, file_path: str):
+        """
+        Writes the statistics to a JSON file.
+
+        Arguments:
+            file_path (str): Path of the file.
+        """
+        with open(file_path, mode="w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
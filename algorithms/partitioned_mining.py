@@ -0,0 +1,166 @@
+"""
+Functions for mining frequent patterns in partitions (shards) of the dataset, in the style of Parallel FP-Growth (PFP).
+"""
+
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms import encode_dataset, fp_tree_construction, fp_growth
+
+
+def item_groups(n_items: int, groups: int):
+    """
+    Splits the item ids into groups. The items are dealt in turns in descending order of support,
+    so every group receives items of every frequency and the shards have similar sizes.
+
+    Arguments:
+        n_items (int): Number of item ids.
+        groups (int): Number of groups.
+
+    Returns:
+        list: Group of each item id.
+    """
+    return [item % groups for item in range(n_items)]
+
+
+def write_shards(transactions, group_of: list, groups: int, shard_dir: str):
+    """
+    Writes the group-dependent transactions of each group to its shard file.
+
+    For each transaction and each group with items in it, the prefix of the transaction up to the last
+    item of the group is written to the shard of that group. Every itemset whose last item belongs to
+    a group can be then mined from its shard alone, with the same support as in the whole dataset.
+    Each line of a shard holds the count of the transaction followed by its item ids.
+
+    Arguments:
+        transactions (iterable): Pairs with the item ids of each transaction, sorted by id, and its count.
+        group_of (list): Group of each item id.
+        groups (int): Number of groups.
+        shard_dir (str): Directory where the shard files are written.
+
+    Returns:
+        list: Paths of the shard files, indexed by group.
+    """
+    paths = [os.path.join(shard_dir, f"shard_{group}.txt") for group in range(groups)]
+    files = [open(path, mode="w") for path in paths]
+    try:
+        for items, count in transactions:
+            written = set()
+            # The prefixes are found from the end of the transaction, where the last item of each group is
+            for end in range(len(items), 0, -1):
+                group = group_of[items[end - 1]]
+                if group not in written:
+                    written.add(group)
+                    files[group].write(f"{count}\t{' '.join(map(str, items[:end]))}\n")
+    finally:
+        for file in files:
+            file.close()
+
+    return paths
+
+
+def read_shard(shard_path: str):
+    """
+    Reads a shard file as a weighted dataset of item ids.
+
+    Arguments:
+        shard_path (str): Path of the shard file.
+
+    Returns:
+        list: List of (transaction, count) pairs.
+    """
+    with open(shard_path, mode="r") as file:
+        shard = []
+        for line in file:
+            count, items = line.rstrip("\n").split("\t")
+            shard.append(([int(item) for item in items.split()], int(count)))
+    return shard
+
+
+def mine_shard(shard_path: str, items: set, minimum_support: int, item_dictionary, backend: str = "node"):
+    """
+    Mines the frequent itemsets whose last item belongs to the group of a shard.
+
+    The shard tree keeps the items sorted by id, as in the global tree, so FP-Growth only needs to
+    mine the items of the group in its header table.
+
+    Arguments:
+        shard_path (str): Path of the shard file.
+        items (set): Item ids of the group of the shard.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        item_dictionary (ItemDictionary): Dictionary of the item ids of the whole dataset.
+        backend (str): Storage used for the trees (default="node").
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets of the group.
+    """
+    _, header_table = fp_tree_construction(read_shard(shard_path), minimum_support, is_header=False, weighted=True,
+                                           backend=backend, item_dictionary=item_dictionary, canonical=True)
+    return fp_growth(header_table, minimum_support, items=items)
+
+
+def partitioned_fp_growth(dataset, minimum_support: int = 1, is_header: bool = True, groups: int = 4,
+                          workers: int = 1, shard_dir: str = None, backend: str = "node", sparse: bool = None,
+                          scan_summary: dict = None):
+    """
+    Mines the frequent itemsets of a dataset partitioned in shards, so no single FP-tree holds the whole dataset.
+
+    A global first scan encodes the items, which are split into groups. The group-dependent transactions
+    of each group are written to a shard file, and each shard is mined independently in a separate worker
+    process. Since every itemset is only mined in the shard of the group of its last item, the results of
+    the shards are disjoint and are merged into a single dictionary.
+
+    Arguments:
+        dataset (list): Dataset in any of the formats accepted by fp_tree_construction.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1).
+        is_header (bool): Boolean flag indicating whether the dataset includes a header in the first row.
+        groups (int): Number of item groups, which is the number of shards (default=4).
+        workers (int): Number of worker processes mining the shards (default=1).
+        shard_dir (str): Directory where the shard files are written. A temporary directory, removed at
+            the end, is used if it is None (default=None).
+        backend (str): Storage used for the trees (default="node").
+        sparse (bool): Whether the transactions are lists of items (True) or binary rows (False). It is
+            guessed from the dataset if it is None (see encode_dataset) (default=None).
+        scan_summary (dict): Dictionary where the summary of the global first scan is stored, if it
+            is given (see summarize_scan) (default=None).
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys.
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids.
+    """
+    if groups < 1:
+        raise ValueError("At least one item group is needed.")
+
+    # Global first scan
+    item_dictionary, _, transactions = encode_dataset(dataset, minimum_support, is_header, scan_summary=scan_summary,
+                                                      sparse=sparse)
+    group_of = item_groups(len(item_dictionary), groups)
+    group_items = [{item for item, group in enumerate(group_of) if group == g} for g in range(groups)]
+
+    temporary = shard_dir is None
+    if temporary:
+        shard_dir = tempfile.mkdtemp(prefix="fp_shards_")
+    else:
+        os.makedirs(shard_dir, exist_ok=True)
+
+    try:
+        paths = write_shards(transactions, group_of, groups, shard_dir)
+
+        frequent_itemsets = {}
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(mine_shard, path, items, minimum_support, item_dictionary, backend)
+                           for path, items in zip(paths, group_items)]
+                for future in futures:
+                    frequent_itemsets.update(future.result())
+        else:
+            for path, items in zip(paths, group_items):
+                frequent_itemsets.update(mine_shard(path, items, minimum_support, item_dictionary, backend))
+    finally:
+        if temporary:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+    return frequent_itemsets, item_dictionary
@@ -3,23 +3,144 @@ Functions for mining frequent patterns with FP-tree by pattern fragment growth.
 """
 
 
-from algorithms import HeaderTable, fp_tree_construction
+import heapq
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+
+from algorithms import HeaderTable, ArrayFPTree, fp_tree_construction
+from algorithms.maximal_closed_itemset_mining import SubsetIndex
+
+
+# Settings shared by all the tasks of a worker process of the parallel FP-Growth
+_worker_settings = {}
+
+
+def _conditional_pattern_base(header_table: HeaderTable, item):
+    """
+    Finds the conditional pattern base of an item. Each prefix path is stored once together with its count.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree.
+        item (int): Item whose prefix paths are collected.
+
+    Returns:
+        list: List of (path, count) pairs, skipping the empty paths.
+    """
+    return [(path, count) for path, count in header_table.prefix_paths(item) if path]
+
+
+def _conditional_tree(conditional_pattern: list, minimum_support: int, backend: str, item_dictionary, stats=None):
+    """
+    Builds the conditional FP-Tree of a conditional pattern base, with the backend and the item ids of the tree
+    it comes from.
+
+    Arguments:
+        conditional_pattern (list): Conditional pattern base, as (path, count) pairs.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): Storage used for the conditional tree.
+        item_dictionary (ItemDictionary): Dictionary of the item ids in the conditional pattern base.
+        stats (MiningStats): Collector of the statistics of the mining, or None (default=None).
+
+    Returns:
+        conditional_tree (Node | SlotNode | ArrayFPTree): The root of the conditional tree.
+        conditional_header_table (HeaderTable | ArrayHeaderTable): The header table of the conditional tree.
+    """
+    with stats.phase("conditional_trees") if stats is not None else nullcontext():
+        conditional_tree, conditional_header_table = fp_tree_construction(conditional_pattern, minimum_support,
+                                                                          is_header=False, weighted=True,
+                                                                          backend=backend,
+                                                                          item_dictionary=item_dictionary)
+    if stats is not None:
+        stats.record_tree(conditional_header_table, conditional=True)
+    return conditional_tree, conditional_header_table
+
+
+def _mine_conditional_pattern(conditional_pattern: list, suffix: list, frequent_itemsets: dict, minimum_support: int,
+                              backend: str, item_dictionary):
+    """
+    Builds the conditional FP-Tree of a conditional pattern base and applies FP-Growth to it.
+
+    Arguments:
+        conditional_pattern (list): Conditional pattern base, as (path, count) pairs.
+        suffix (list): List containing the suffix of the conditional pattern base.
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, which is updated.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): Storage used for the conditional tree.
+        item_dictionary (ItemDictionary): Dictionary of the item ids in the conditional pattern base.
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets.
+    """
+    _, conditional_header_table = _conditional_tree(conditional_pattern, minimum_support, backend, item_dictionary)
+
+    if conditional_header_table.table:
+        frequent_itemsets = _fp_growth_recursive(conditional_header_table, suffix, frequent_itemsets, minimum_support)
+
+    return frequent_itemsets
+
+
+def _iter_fp_growth_recursive(header_table: HeaderTable, suffix: list, minimum_support: int, items: set = None,
+                              stats=None):
+    """
+    Private recursive generator of the FP-Growth algorithm, which yields each frequent itemset as soon as
+    it is found. Only the conditional trees of the current branch are held in memory.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree, containing references
+            to the first occurrence of each item in the tree.
+        suffix (list): List containing the suffix of the conditional path being explored.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        items (set): Items of the header table to mine. All of them are mined if it is None (default=None).
+        stats (MiningStats): Collector of the statistics of the mining, or None (default=None).
+
+    Yields:
+        tuple: A frequent itemset, as a tuple of item ids, and its support.
+    """
+    for item, links_counts in reversed(header_table.table.items()):
+        if items is not None and item not in items:
+            continue
+        # Trees updated incrementally keep the infrequent items
+        if links_counts["count"] < minimum_support:
+            continue
+
+        # Yield the frequent itemset
+        new_suffix = suffix + [item]
+        if stats is not None:
+            stats.record_itemset(len(new_suffix))
+        yield tuple(new_suffix), links_counts["count"]
+
+        # Find conditional pattern base. The statistics are only collected if they are requested
+        with stats.phase("conditional_bases") if stats is not None else nullcontext():
+            conditional_pattern = _conditional_pattern_base(header_table, item)
+        if stats is not None:
+            stats.record_walk(links_counts["nodes"])
+
+        # Build the new FP-Tree from the base and apply fp_growth to the new tree recursively
+        if conditional_pattern:
+            _, conditional_header_table = _conditional_tree(conditional_pattern, minimum_support,
+                                                            header_table.backend, header_table.item_dictionary,
+                                                            stats)
+            if conditional_header_table.table:
+                yield from _iter_fp_growth_recursive(conditional_header_table, new_suffix, minimum_support,
+                                                     stats=stats)
 
 
 def _fp_growth_recursive(header_table: HeaderTable, suffix: list = None, frequent_itemsets: dict = None,
-              minimum_support: int = 1):
+              minimum_support: int = 1, items: set = None, stats=None):
     """
     Private recursive implementation of the FP-Growth algorithm.
 
-    Applies pattern fragment growth (FP-Growth) to mine the frequent itemsets for the 
+    Applies pattern fragment growth (FP-Growth) to mine the frequent itemsets for the
     given FP-Tree.
 
     Arguments:
-        header_table (HeaderTable): The header table of the FP-Tree, containing references
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree, containing references
             to the first occurrence of each item in the tree.
         suffix (list): List containing the suffix of the conditional path being explored.
         frequent_itemsets (dict): Dictionary of the frequent itemsets.
         minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        items (set): Items of the header table to mine. All of them are mined if it is None (default=None).
+        stats (MiningStats): Collector of the statistics of the mining, or None (default=None).
 
     Returns:
         frequent_itemsets (dict): Dictionary of the frequent itemsets.
@@ -29,52 +150,427 @@ def _fp_growth_recursive(header_table: HeaderTable, suffix: list = None, frequen
     if frequent_itemsets is None:
         frequent_itemsets = {}
 
-    for item, links_counts in reversed(header_table.table.items()):
-        # Store the frequent itemsets
-        new_suffix = suffix + [item]
-        frequent_itemsets[tuple(new_suffix)] = links_counts["count"]
+    frequent_itemsets.update(_iter_fp_growth_recursive(header_table, suffix, minimum_support, items, stats))
+    return frequent_itemsets
 
-        # Find conditional pattern base
-        conditional_pattern = []
-        current_node = header_table.get(item)["node"]
 
-        while current_node is not None:
-            current_pattern = []
-            parent = current_node.parent
-            current_count = current_node.counter
+def _init_worker(minimum_support: int, backend: str, item_dictionary):
+    """
+    Stores the settings shared by all the tasks of a worker process, so they are sent only once.
 
-            while parent.value != "root":
-                current_pattern.append(parent.value)
-                parent = parent.parent
-            current_pattern.reverse()
+    Arguments:
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): Storage used for the conditional trees.
+        item_dictionary (ItemDictionary): Dictionary of the item ids.
+    """
+    _worker_settings["minimum_support"] = minimum_support
+    _worker_settings["backend"] = backend
+    _worker_settings["item_dictionary"] = item_dictionary
 
-            if current_pattern:
-                for _ in range(current_count):
-                    conditional_pattern.append(current_pattern)
 
-            current_node = current_node.node_link
+def _mine_in_worker(conditional_pattern: list, suffix: list):
+    """
+    Task of the parallel FP-Growth, which mines the conditional pattern base of an item in a worker process.
 
-        # Build the new FP-Tree from the base and apply fp_growth to the new tree recursively
+    Arguments:
+        conditional_pattern (list): Conditional pattern base, as (path, count) pairs.
+        suffix (list): List containing the suffix of the conditional pattern base.
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets with the given suffix.
+    """
+    return _mine_conditional_pattern(conditional_pattern, suffix, {}, _worker_settings["minimum_support"],
+                                     _worker_settings["backend"], _worker_settings["item_dictionary"])
+
+
+def _parallel_fp_growth(header_table: HeaderTable, minimum_support: int, workers: int, items: set = None):
+    """
+    Applies FP-Growth mining the conditional pattern base of each item of the header table in a process pool.
+
+    The subproblems are independent once the tree exists. They are submitted from the largest to the
+    smallest conditional pattern base, so the long tasks start first and the load is balanced among
+    the workers. The partial results are merged as they are completed.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        workers (int): Number of worker processes.
+        items (set): Items of the header table to mine. All of them are mined if it is None (default=None).
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets.
+    """
+    frequent_itemsets = {}
+    tasks = []
+    for item, links_counts in reversed(header_table.table.items()):
+        if items is not None and item not in items:
+            continue
+        # Trees updated incrementally keep the infrequent items
+        if links_counts["count"] < minimum_support:
+            continue
+        frequent_itemsets[(item,)] = links_counts["count"]
+        conditional_pattern = _conditional_pattern_base(header_table, item)
         if conditional_pattern:
-            conditional_tree, conditional_header_table = fp_tree_construction(conditional_pattern, minimum_support, is_header=False)
+            size = sum(len(path) for path, _ in conditional_pattern)
+            tasks.append((size, item, conditional_pattern))
+
+    # Largest-first schedule
+    tasks.sort(key=lambda task: task[0], reverse=True)
 
-            if conditional_header_table.table.items() and conditional_tree.children:
-                frequent_itemsets = _fp_growth_recursive(conditional_header_table, new_suffix, frequent_itemsets, minimum_support)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(minimum_support, header_table.backend, header_table.item_dictionary)) as pool:
+        futures = [pool.submit(_mine_in_worker, conditional_pattern, [item])
+                   for _, item, conditional_pattern in tasks]
+        for future in as_completed(futures):
+            frequent_itemsets.update(future.result())
 
     return frequent_itemsets
 
 
-def fp_growth(header_table: HeaderTable, minimum_support: int = 1):
+def fp_growth(header_table: HeaderTable, minimum_support: int = 1, workers: int = 1, items: set = None,
+              stats=None):
     """
-    Applies pattern fragment growth (FP-Growth) to mine the frequent itemsets for the 
+    Applies pattern fragment growth (FP-Growth) to mine the frequent itemsets for the
     given FP-Tree.
 
     Arguments:
         header_table (HeaderTable): The header table of the FP-Tree, containing references
             to the first occurrence of each item in the tree.
         minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        workers (int): Number of processes mining the conditional pattern bases of the items of the
+            header table in parallel. With 1, the mining runs in the current process (default=1).
+        items (set): Items of the header table to mine. Only the itemsets whose last item in the order of the
+            tree is one of them are found. All of them are mined if it is None (default=None).
+        stats (MiningStats): Collector of the statistics of the mining, or None (default=None). The worker
+            processes do not report them, so with several workers only the number of itemsets is recorded.
 
     Returns:
-        frequent_itemsets (dict): Dictionary of the frequent itemsets.
+        frequent_itemsets (dict): Dictionary of the frequent itemsets. The itemsets are tuples of item ids,
+            which can be converted back to item names with `header_table.item_dictionary.decode_itemsets`.
+    """
+    if workers > 1:
+        frequent_itemsets = _parallel_fp_growth(header_table, minimum_support, workers, items)
+        if stats is not None:
+            stats.itemsets += len(frequent_itemsets)
+        return frequent_itemsets
+    return _fp_growth_recursive(header_table, minimum_support=minimum_support, items=items, stats=stats)
+
+
+def iter_fp_growth(header_table: HeaderTable, minimum_support: int = 1, items: set = None, stats=None):
+    """
+    Applies pattern fragment growth (FP-Growth) to the given FP-Tree, yielding the frequent itemsets as they
+    are found instead of collecting them in a dictionary, so they can be written out without holding all of
+    them in memory.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree, containing references
+            to the first occurrence of each item in the tree.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        items (set): Items of the header table to mine. Only the itemsets whose last item in the order of the
+            tree is one of them are found. All of them are mined if it is None (default=None).
+        stats (MiningStats): Collector of the statistics of the mining, or None (default=None).
+
+    Yields:
+        tuple: A frequent itemset, as a tuple of item ids, and its support.
+    """
+    return _iter_fp_growth_recursive(header_table, [], minimum_support, items, stats)
+
+
+def _split_closure(conditional_pattern: list, support: int, minimum_support: int):
+    """
+    Splits the frequent items of a conditional pattern base into the ones present in all its transactions,
+    which belong to the closure of the suffix, and the rest.
+
+    Arguments:
+        conditional_pattern (list): Conditional pattern base, as (path, count) pairs.
+        support (int): Support of the suffix of the conditional pattern base.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+
+    Returns:
+        closure (list): Items with the same support as the suffix.
+        tail (list): The other frequent items.
+        conditional_pattern (list): Conditional pattern base without the closure items.
     """
-    return _fp_growth_recursive(header_table, minimum_support=minimum_support)
\ No newline at end of file
+    item_support = {}
+    for path, count in conditional_pattern:
+        for item in path:
+            item_support[item] = item_support.get(item, 0) + count
+
+    closure = [item for item, count in item_support.items() if count == support]
+    tail = [item for item, count in item_support.items() if minimum_support <= count < support]
+
+    if closure:
+        closure_items = set(closure)
+        conditional_pattern = [([item for item in path if item not in closure_items], count)
+                               for path, count in conditional_pattern]
+        conditional_pattern = [(path, count) for path, count in conditional_pattern if path]
+
+    return closure, tail, conditional_pattern
+
+
+def _single_path(tree):
+    """
+    Returns the items of the tree and the counter of the deepest node if the tree is a single path.
+
+    Arguments:
+        tree (Node | SlotNode | ArrayFPTree): The root of the FP-tree.
+
+    Returns:
+        tuple: List of items from the root and the counter of the last node, or None if the tree branches.
+    """
+    path = []
+    if isinstance(tree, ArrayFPTree):
+        node, count = tree.first_child[0], 0
+        while node != -1:
+            if tree.next_sibling[node] != -1:
+                return None
+            path.append(tree.item[node])
+            node, count = tree.first_child[node], tree.count[node]
+    else:
+        node, count = tree, 0
+        while node.children:
+            if len(node.children) > 1:
+                return None
+            node = next(iter(node.children.values()))
+            path.append(node.value)
+            count = node.counter
+    return path, count
+
+
+def _fp_close_recursive(header_table: HeaderTable, suffix: list, closed_itemsets: dict, closed_index: dict,
+                        minimum_support: int):
+    """
+    Private recursive implementation of the FPClose algorithm.
+
+    Each suffix is extended with its closure, the items present in all the transactions of its conditional
+    pattern base, which are then removed from the conditional tree. The extended suffix is closed unless a
+    closed itemset found before, with the same support, contains it. In that case, the whole branch only
+    holds itemsets that are not closed or were already found, so it is pruned.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree.
+        suffix (list): List containing the suffix of the conditional path being explored.
+        closed_itemsets (dict): Dictionary of the closed itemsets, which is updated.
+        closed_index (dict): SubsetIndex of the closed itemsets found so far for each support.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+    """
+    for item, links_counts in reversed(header_table.table.items()):
+        support = links_counts["count"]
+        if support < minimum_support:
+            continue
+        conditional_pattern = _conditional_pattern_base(header_table, item)
+        closure, tail, conditional_pattern = _split_closure(conditional_pattern, support, minimum_support)
+        new_suffix = suffix + [item] + closure
+
+        # Prune the branch if a closed superset with the same support was already found
+        index = closed_index.setdefault(support, SubsetIndex())
+        if index.has_superset(new_suffix):
+            continue
+        closed_itemsets[tuple(new_suffix)] = support
+        index.add(new_suffix)
+
+        # Every extension with the tail items has a lower support, so it is mined in the conditional tree
+        if tail:
+            _, conditional_header_table = _conditional_tree(conditional_pattern, minimum_support,
+                                                            header_table.backend, header_table.item_dictionary)
+            if conditional_header_table.table:
+                _fp_close_recursive(conditional_header_table, new_suffix, closed_itemsets, closed_index, minimum_support)
+
+
+def _fp_max_recursive(header_table: HeaderTable, suffix: list, maximal_itemsets: dict, maximal_index: SubsetIndex,
+                      minimum_support: int):
+    """
+    Private recursive implementation of the FPMax algorithm.
+
+    A branch is pruned when its suffix together with all the frequent items of its conditional pattern base
+    is contained in a maximal itemset found before. The candidates are the suffixes without frequent
+    extensions and the itemsets of the conditional trees with a single path, which are maximal unless a
+    maximal itemset found before contains them.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree.
+        suffix (list): List containing the suffix of the conditional path being explored.
+        maximal_itemsets (dict): Dictionary of the maximal itemsets, which is updated.
+        maximal_index (SubsetIndex): Index of the maximal itemsets found so far.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+    """
+    for item, links_counts in reversed(header_table.table.items()):
+        support = links_counts["count"]
+        if support < minimum_support:
+            continue
+        conditional_pattern = _conditional_pattern_base(header_table, item)
+        closure, tail, conditional_pattern = _split_closure(conditional_pattern, support, minimum_support)
+        new_suffix = suffix + [item] + closure
+
+        # Prune the branch if all its itemsets are contained in a maximal itemset already found
+        if maximal_index.has_superset(new_suffix + tail):
+            continue
+
+        if not tail:
+            candidate = new_suffix
+        else:
+            conditional_tree, conditional_header_table = _conditional_tree(conditional_pattern, minimum_support,
+                                                                           header_table.backend,
+                                                                           header_table.item_dictionary)
+
+            single_path = _single_path(conditional_tree)
+            if single_path is None:
+                _fp_max_recursive(conditional_header_table, new_suffix, maximal_itemsets, maximal_index,
+                                  minimum_support)
+                continue
+            path, support = single_path
+            candidate = new_suffix + path
+
+        if not maximal_index.has_superset(candidate):
+            maximal_itemsets[tuple(candidate)] = support
+            maximal_index.add(candidate)
+
+
+def fp_close(header_table: HeaderTable, minimum_support: int = 1):
+    """
+    Mines the closed frequent itemsets of the given FP-Tree directly, without enumerating all the
+    frequent itemsets (FPClose).
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree, containing references
+            to the first occurrence of each item in the tree.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+
+    Returns:
+        closed_itemsets (dict): Dictionary of the closed frequent itemsets, with tuples of item ids as keys.
+    """
+    closed_itemsets = {}
+    _fp_close_recursive(header_table, [], closed_itemsets, {}, minimum_support)
+    return closed_itemsets
+
+
+def fp_max(header_table: HeaderTable, minimum_support: int = 1):
+    """
+    Mines the maximal frequent itemsets of the given FP-Tree directly, without enumerating all the
+    frequent itemsets (FPMax).
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree, containing references
+            to the first occurrence of each item in the tree.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+
+    Returns:
+        maximal_itemsets (dict): Dictionary of the maximal frequent itemsets, with tuples of item ids as keys.
+    """
+    maximal_itemsets = {}
+    _fp_max_recursive(header_table, [], maximal_itemsets, SubsetIndex(), minimum_support)
+    return maximal_itemsets
+
+
+def _top_k_threshold(heap: list, k: int, minimum_support: int):
+    """
+    Returns the effective minimum support of the top-k mining. Once the heap holds k itemsets, only the
+    ones with a greater support than the worst of them can enter it.
+
+    Arguments:
+        heap (list): Min-heap of (support, itemset) pairs with the best itemsets found so far.
+        k (int): Number of itemsets to find.
+        minimum_support (int): The minimum support given by the user.
+
+    Returns:
+        int: The minimum support for the rest of the mining.
+    """
+    if len(heap) < k:
+        return minimum_support
+    return max(minimum_support, heap[0][0] + 1)
+
+
+def _push_top_k(heap: list, k: int, itemset: tuple, support: int):
+    """
+    Adds an itemset to the heap of the top-k mining, dropping the worst one if it is full.
+
+    Arguments:
+        heap (list): Min-heap of (support, itemset) pairs with the best itemsets found so far.
+        k (int): Number of itemsets to find.
+        itemset (tuple): Item ids of the itemset.
+        support (int): Support of the itemset.
+    """
+    if len(heap) < k:
+        heapq.heappush(heap, (support, itemset))
+    elif support > heap[0][0]:
+        heapq.heapreplace(heap, (support, itemset))
+
+
+def _top_k_recursive(header_table: HeaderTable, suffix: list, heap: list, k: int, minimum_support: int,
+                     min_length: int, max_length: int):
+    """
+    Private recursive implementation of the top-k FP-Growth.
+
+    The items of the header table are explored from the most frequent, so the heap is filled with high
+    supports early. The effective minimum support is checked again before each item and used for building
+    each conditional tree, so the trees built later are pruned harder.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree.
+        suffix (list): List containing the suffix of the conditional path being explored.
+        heap (list): Min-heap of (support, itemset) pairs with the best itemsets found so far, which is updated.
+        k (int): Number of itemsets to find.
+        minimum_support (int): The minimum support given by the user.
+        min_length (int): Minimum number of items of the itemsets kept.
+        max_length (int): Maximum number of items of the itemsets explored, or None for no limit.
+    """
+    for item, links_counts in header_table.table.items():
+        support = links_counts["count"]
+        if support < _top_k_threshold(heap, k, minimum_support):
+            continue
+
+        # The single items are added from the header table before the recursion
+        new_suffix = suffix + [item]
+        if len(new_suffix) > 1 and len(new_suffix) >= min_length:
+            _push_top_k(heap, k, tuple(new_suffix), support)
+
+        # The supersets are longer than the maximum length
+        if max_length is not None and len(new_suffix) >= max_length:
+            continue
+
+        conditional_pattern = _conditional_pattern_base(header_table, item)
+        if conditional_pattern:
+            _, conditional_header_table = _conditional_tree(conditional_pattern,
+                                                            _top_k_threshold(heap, k, minimum_support),
+                                                            header_table.backend, header_table.item_dictionary)
+            if conditional_header_table.table:
+                _top_k_recursive(conditional_header_table, new_suffix, heap, k, minimum_support, min_length,
+                                 max_length)
+
+
+def fp_growth_top_k(header_table: HeaderTable, k: int, minimum_support: int = 1, min_length: int = 1,
+                    max_length: int = None):
+    """
+    Mines the k frequent itemsets with the highest support for the given FP-Tree, without a hand-tuned
+    minimum support.
+
+    The best itemsets found so far are kept in a bounded heap. Once it is full, the effective minimum
+    support is raised to beat the worst of them, which prunes the rest of the recursion. Among itemsets
+    with the same support at the boundary, the ones found first are kept.
+
+    Arguments:
+        header_table (HeaderTable | ArrayHeaderTable): The header table of the FP-Tree, built with a
+            minimum support not greater than the one given here.
+        k (int): Number of itemsets to find.
+        minimum_support (int): Lower bound of the support of the itemsets (default=1).
+        min_length (int): Minimum number of items of the itemsets (default=1).
+        max_length (int): Maximum number of items of the itemsets, or None for no limit (default=None).
+
+    Returns:
+        top_itemsets (dict): Dictionary of the top-k itemsets, with tuples of item ids as keys, in
+            descending order of support.
+    """
+    if k < 1:
+        raise ValueError("At least one itemset must be requested.")
+    if max_length is not None and max_length < min_length:
+        raise ValueError("The maximum length cannot be lower than the minimum length.")
+
+    heap = []
+    if min_length <= 1:
+        # The single items are known from the header table, so they raise the threshold before any recursion
+        for item, links_counts in header_table.table.items():
+            if links_counts["count"] >= minimum_support:
+                _push_top_k(heap, k, (item,), links_counts["count"])
+    _top_k_recursive(header_table, [], heap, k, minimum_support, min_length, max_length)
+
+    return {itemset: support for support, itemset in sorted(heap, key=lambda entry: (-entry[0], entry[1]))}
@@ -0,0 +1,220 @@
+"""
+Cache of frequent itemset mining results, for mining the same dataset at several minimum supports.
+"""
+
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from algorithms.item_dictionary import ItemDictionary
+from algorithms.maximal_closed_itemset_mining import find_closed_itemsets, find_maximal_itemsets
+from utils.loaders import DEFAULT_BUFFER_SIZE
+
+
+def dataset_fingerprint(file_path: str, *options, buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Computes a fingerprint of a dataset file from its contents and the options used for loading it.
+
+    Arguments:
+        file_path (str): Path of the file.
+        *options: Options that change how the file is read, like its format or delimiter.
+        buffer_size (int): Size in bytes of the read buffer (default=DEFAULT_BUFFER_SIZE).
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(repr(options).encode("utf-8"))
+    with open(file_path, mode="rb") as file:
+        for chunk in iter(lambda: file.read(buffer_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache of the frequent itemsets of datasets, keyed by their fingerprint.
+
+    The frequent itemsets at a given minimum support are a subset of the ones at any lower support, so only
+    the result with the lowest support of each dataset is kept, and the requests with a higher support are
+    answered by filtering it. The same holds for the closed itemsets, which are computed once for the kept
+    result, while the maximal itemsets are the maximal elements of the filtered closed itemsets.
+
+    The results are kept in memory with a least recently used (LRU) eviction policy. With a cache directory,
+    they are also stored on disk as pickle files, which are evicted in the same way.
+
+    Arguments:
+        capacity (int): Number of results kept in memory (default=8).
+        cache_dir (str): Directory where the results are stored, or None for a memory-only cache (default=None).
+        disk_capacity (int): Number of results kept in the cache directory (default=64).
+    """
+    def __init__(self, capacity: int = 8, cache_dir: str = None, disk_capacity: int = 64):
+        if capacity < 1 or disk_capacity < 1:
+            raise ValueError("The cache must hold at least one result.")
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self.disk_capacity = disk_capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, fingerprint: str):
+        """Returns the path of the file of a result in the cache directory."""
+        return os.path.join(self.cache_dir, f"{fingerprint}.pickle")
+
+    def _get(self, fingerprint: str):
+        """
+        Returns the entry of a dataset, loading it from disk if it is not in memory.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+
+        Returns:
+            dict: The entry, or None if the dataset is not cached.
+        """
+        entry = self.entries.get(fingerprint)
+        if entry is not None:
+            self.entries.move_to_end(fingerprint)
+            return entry
+
+        if self.cache_dir is None or not os.path.exists(self._path(fingerprint)):
+            return None
+        with open(self._path(fingerprint), mode="rb") as file:
+            entry = pickle.load(file)
+        # The access time of the file is its modification time, used for the eviction
+        os.utime(self._path(fingerprint))
+        self._keep(fingerprint, entry)
+        return entry
+
+    def _keep(self, fingerprint: str, entry: dict):
+        """
+        Keeps an entry in memory, evicting the least recently used one if the cache is full.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+            entry (dict): The entry.
+        """
+        self.entries[fingerprint] = entry
+        self.entries.move_to_end(fingerprint)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def _write(self, fingerprint: str, entry: dict):
+        """
+        Stores an entry in the cache directory, evicting the least recently used files if it is full.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+            entry (dict): The entry.
+        """
+        if self.cache_dir is None:
+            return
+        # Written to a temporary file first, so a partial file is never read
+        temporary = self._path(fingerprint) + ".tmp"
+        with open(temporary, mode="wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self._path(fingerprint))
+
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".pickle")]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - self.disk_capacity)]:
+            os.remove(path)
+
+    def lookup(self, fingerprint: str, minimum_support: int):
+        """
+        Finds the frequent itemsets of a dataset at a minimum support, filtering a cached result.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+            minimum_support (int): The minimum support threshold to determine frequent itemsets.
+
+        Returns:
+            tuple: Dictionary of the frequent itemsets, with tuples of item ids as keys, and the ItemDictionary
+                for decoding them, or None if no result with a lower or equal minimum support is cached.
+        """
+        entry = self._get(fingerprint)
+        if entry is None or entry["minimum_support"] > minimum_support:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        frequent_itemsets = {itemset: support for itemset, support in entry["frequent_itemsets"].items()
+                             if support >= minimum_support}
+        return frequent_itemsets, ItemDictionary(entry["names"])
+
+    def cached_support(self, fingerprint: str):
+        """
+        Returns the minimum support of the cached result of a dataset, or None if it is not cached.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+        """
+        entry = self._get(fingerprint)
+        return None if entry is None else entry["minimum_support"]
+
+    def cached_transactions(self, fingerprint: str):
+        """
+        Returns the number of transactions of a cached dataset, or None if it is not cached or was not stored.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+        """
+        entry = self._get(fingerprint)
+        return None if entry is None else entry.get("n_transactions")
+
+    def store(self, fingerprint: str, minimum_support: int, frequent_itemsets: dict, item_dictionary: ItemDictionary,
+              n_transactions: int = None):
+        """
+        Stores the frequent itemsets of a dataset, unless a result with a lower or equal support is cached.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+            minimum_support (int): The minimum support used for mining the frequent itemsets.
+            frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys.
+            item_dictionary (ItemDictionary): Dictionary for decoding the item ids.
+            n_transactions (int): Number of transactions of the dataset, or None if it is unknown (default=None).
+        """
+        entry = self._get(fingerprint)
+        if entry is not None and entry["minimum_support"] <= minimum_support:
+            return
+
+        entry = {
+            "minimum_support": minimum_support,
+            "frequent_itemsets": frequent_itemsets,
+            "closed_itemsets": None,
+            "names": list(item_dictionary.names),
+            "n_transactions": n_transactions,
+        }
+        self._keep(fingerprint, entry)
+        self._write(fingerprint, entry)
+
+    def closed_maximal(self, fingerprint: str, minimum_support: int):
+        """
+        Finds the closed and maximal itemsets of a dataset at a minimum support from its cached result.
+
+        The closed itemsets of the cached result are found the first time and stored with it. An itemset
+        closed at the cached support is also closed at any higher one, so they are filtered by support.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the dataset.
+            minimum_support (int): The minimum support threshold to determine frequent itemsets.
+
+        Returns:
+            closed, maximal (tuple): Dictionaries of the closed and maximal itemsets, or None if no result with
+                a lower or equal minimum support is cached.
+        """
+        entry = self._get(fingerprint)
+        if entry is None or entry["minimum_support"] > minimum_support:
+            return None
+
+        if entry["closed_itemsets"] is None:
+            entry["closed_itemsets"] = find_closed_itemsets(entry["frequent_itemsets"], order=False)
+            self._write(fingerprint, entry)
+
+        closed_itemsets = {itemset: support for itemset, support in entry["closed_itemsets"].items()
+                           if support >= minimum_support}
+        maximal_itemsets = find_maximal_itemsets(closed_itemsets, order=False)
+        return closed_itemsets, maximal_itemsets
@@ -0,0 +1,221 @@
+"""
+Classes for mining frequent itemsets over a sliding window of a stream of transactions.
+"""
+
+
+import time
+from collections import deque
+
+from algorithms.fp_tree_construction import NODE_BACKENDS, ROOT, HeaderTable, insert_transaction
+from algorithms.item_dictionary import ItemDictionary
+from algorithms.maximal_closed_itemset_mining import find_closed_itemsets
+from algorithms.pattern_fragment_growth import fp_close, fp_growth
+
+
+# Scale of the weights of the decayed transactions at which all the counters are normalized again
+MAX_SCALE = 1e12
+
+# Fraction of the weight of an expired transaction below which a decayed counter is considered zero
+DECAY_TOLERANCE = 1e-9
+
+
+class SlidingWindowMiner:
+    """
+    Miner of the frequent itemsets of the last transactions of a stream, within a window of a number of
+    transactions, a period of time, or both.
+
+    The transactions of the window are kept in an FP-tree in canonical order: items are sorted by their id,
+    given in order of arrival, so the tree never needs restructuring. When a transaction expires, the
+    counters of its path are decremented, and the nodes that reach zero are removed from the tree. They are
+    unlinked from the header table lazily, before the next query.
+
+    With decay, the weight of each transaction is multiplied by `decay` every time a new one arrives. Instead
+    of updating every counter, each new transaction is inserted with a weight `1 / decay` times larger than
+    the previous one, and the counters are divided by the current scale when queried.
+
+    Arguments:
+        window_size (int): Number of transactions in the window, or None for no limit (default=None).
+        window_time (float): Length of the window in the units of the timestamps (seconds by default),
+            or None for no limit (default=None).
+        decay (float): Factor between 0 and 1 applied to the weight of the transactions each time a new
+            one arrives, or None for no decay (default=None).
+        backend (str): "node" or "slots" nodes for the tree (default="node").
+    """
+    def __init__(self, window_size: int = None, window_time: float = None, decay: float = None,
+                 backend: str = "node"):
+        if backend not in NODE_BACKENDS:
+            raise ValueError(f"Unknown FP-tree backend for streams: {backend}")
+        if window_size is not None and window_size < 1:
+            raise ValueError("The window must hold at least one transaction.")
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError("The decay must be between 0 and 1.")
+
+        self.window_size = window_size
+        self.window_time = window_time
+        self.decay = decay
+        self.item_dictionary = ItemDictionary([])
+        self.tree = NODE_BACKENDS[backend](ROOT)
+        self.header_table = HeaderTable({}, backend, self.item_dictionary)
+        self.window = deque() # Items, weight and timestamp of each transaction of the window
+        self.scale = 1
+        self.removed = {} # Number of removed nodes that are still linked, for each item
+
+    def __len__(self):
+        """Returns the number of transactions in the window."""
+        return len(self.window)
+
+    def add(self, transaction, timestamp: float = None):
+        """
+        Adds a transaction to the window, expiring the ones that fall out of it.
+
+        Arguments:
+            transaction (list): Names of the items in the transaction.
+            timestamp (float): Time of the transaction. The current time is used if it is None (default=None).
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        if self.decay is not None:
+            self.scale /= self.decay
+            if self.scale > MAX_SCALE:
+                self._normalize()
+        weight = self.scale
+
+        # New items are added at the end of the canonical order
+        items = set()
+        for name in transaction:
+            if name not in self.item_dictionary:
+                self.header_table.add_item(self.item_dictionary.add(name))
+            items.add(self.item_dictionary.encode(name))
+        items = sorted(items)
+
+        table = self.header_table.table
+        for item in items:
+            table[item]["count"] += weight
+        insert_transaction(items, self.header_table, self.tree, weight)
+        self.window.append((items, weight, timestamp))
+
+        self.expire(timestamp)
+
+    def expire(self, now: float = None):
+        """
+        Removes the transactions that fall out of the window.
+
+        Arguments:
+            now (float): Current time. The current time is used if it is None (default=None).
+        """
+        if self.window_size is not None:
+            while len(self.window) > self.window_size:
+                self._remove(*self.window.popleft()[:2])
+
+        if self.window_time is not None:
+            if now is None:
+                now = time.time()
+            while self.window and self.window[0][2] <= now - self.window_time:
+                self._remove(*self.window.popleft()[:2])
+
+    def _remove(self, items: list, weight: float):
+        """
+        Decrements the counters of the path of an expired transaction, and removes its nodes that reach zero.
+
+        Arguments:
+            items (list): Item ids of the transaction, sorted in the order of the tree.
+            weight (float): Weight with which the transaction was inserted.
+        """
+        # Newer transactions weigh at least as much, so a smaller remainder is a rounding error
+        tolerance = weight * DECAY_TOLERANCE if self.decay is not None else 0
+
+        table = self.header_table.table
+        for item in items:
+            table[item]["count"] -= weight
+
+        node = self.tree
+        for item in items:
+            child = node.children[item]
+            child.counter -= weight
+            if child.counter <= tolerance:
+                # The rest of the path only holds this transaction, so it is removed at once
+                del node.children[item]
+                while child is not None:
+                    child.counter = 0
+                    self.removed[child.value] = self.removed.get(child.value, 0) + 1
+                    child = next(iter(child.children.values()), None)
+                break
+            node = child
+
+        if tolerance:
+            for item in items:
+                if table[item]["count"] <= tolerance:
+                    table[item]["count"] = 0
+
+    def _unlink_removed(self):
+        """
+        Unlinks the removed nodes from the chains of the header table.
+        """
+        for item in self.removed:
+            entry = self.header_table.table[item]
+            node = entry["node"]
+            entry["node"], entry["tail"], entry["nodes"] = None, None, 0
+            while node is not None:
+                next_node = node.node_link
+                node.node_link = None
+                if node.counter > 0:
+                    self.header_table.add_node_link(node)
+                node = next_node
+        self.removed = {}
+
+    def _normalize(self):
+        """
+        Divides all the counters and weights by the current scale, which is reset to 1.
+        """
+        scale = self.scale
+        stack = list(self.tree.children.values())
+        while stack:
+            node = stack.pop()
+            node.counter /= scale
+            stack.extend(node.children.values())
+        for entry in self.header_table.table.values():
+            entry["count"] /= scale
+        self.window = deque((items, weight / scale, timestamp) for items, weight, timestamp in self.window)
+        self.scale = 1
+
+    def frequent_itemsets(self, minimum_support: float = 1):
+        """
+        Mines the frequent itemsets of the transactions in the window.
+
+        Arguments:
+            minimum_support (float): The minimum support threshold to determine frequent itemsets. With decay,
+                it is compared with the decayed supports (default=1).
+
+        Returns:
+            frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys,
+                which can be decoded with `item_dictionary`.
+        """
+        if self.removed:
+            self._unlink_removed()
+        frequent_itemsets = fp_growth(self.header_table, minimum_support * self.scale)
+        if self.decay is not None:
+            frequent_itemsets = {itemset: support / self.scale for itemset, support in frequent_itemsets.items()}
+        return frequent_itemsets
+
+    def closed_itemsets(self, minimum_support: float = 1):
+        """
+        Mines the closed frequent itemsets of the transactions in the window.
+
+        Arguments:
+            minimum_support (float): The minimum support threshold to determine frequent itemsets. With decay,
+                it is compared with the decayed supports (default=1).
+
+        Returns:
+            closed_itemsets (dict): Dictionary of the closed frequent itemsets, with tuples of item ids as keys,
+                which can be decoded with `item_dictionary`.
+        """
+        if self.decay is None:
+            if self.removed:
+                self._unlink_removed()
+            return fp_close(self.header_table, minimum_support)
+
+        # Decayed supports are sums of floats, so they are rounded before comparing them
+        frequent_itemsets = self.frequent_itemsets(minimum_support)
+        rounded = {itemset: round(support, 9) for itemset, support in frequent_itemsets.items()}
+        return {itemset: frequent_itemsets[itemset] for itemset in find_closed_itemsets(rounded, order=False)}
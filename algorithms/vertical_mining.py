@@ -0,0 +1,234 @@
+"""
+Functions for mining frequent itemsets with a vertical representation of the dataset (Eclat and dEclat).
+
+Each frequent item is mapped to the set of transactions that contain it (its tidset), stored as the bits
+of a Python integer, so the support of an itemset is the number of bits set in the AND of the tidsets
+of its items. Dense datasets, where most transactions contain most items, are mined faster this way
+than through the conditional FP-trees of FP-Growth.
+
+NumPy is an optional dependency, used for packing the columns of binary matrices into tidsets.
+"""
+
+
+from algorithms.fp_tree_construction import build_tree, encode_dataset, NODE_BACKENDS
+from algorithms.pattern_fragment_growth import fp_growth
+from utils.binary_matrix import BinaryMatrix
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Engines for mining the frequent itemsets. "auto" chooses between "fp-growth" and "eclat" by density
+ENGINES = ("fp-growth", "eclat", "declat", "auto")
+
+# Density of the dataset from which "auto" mines it with Eclat instead of FP-Growth. Below it, the tidsets
+# are mostly zeros and the intersections of every pair of items cost more than the conditional FP-trees
+DENSITY_THRESHOLD = 0.01
+
+# Number of bits set in an integer. int.bit_count is only available since Python 3.10
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:
+    def _popcount(bits: int):
+        return bin(bits).count("1")
+
+
+def _matrix_tidsets(matrix: BinaryMatrix, item_order: list):
+    """
+    Packs the columns of the frequent items of a binary matrix into tidsets.
+
+    Arguments:
+        matrix (BinaryMatrix): The dataset.
+        item_order (list): List with the items sorted in descending order of support.
+
+    Returns:
+        list: The tidset of each item, in the order of `item_order`.
+    """
+    column = {item: i for i, item in enumerate(matrix.header)}
+    tidsets = []
+    for item in item_order:
+        # Bit i of the packed bytes, in little-endian order, is the value of the item in transaction i
+        packed = np.packbits(matrix.matrix[:, column[item]].astype(bool), bitorder="little")
+        tidsets.append(int.from_bytes(packed.tobytes(), "little"))
+    return tidsets
+
+
+def _transaction_tidsets(transactions, n_items: int):
+    """
+    Builds the tidsets of the items from the transactions of the second scan. A transaction that appears
+    several times is given consecutive transaction ids.
+
+    Arguments:
+        transactions (iterable): Pairs with the item ids of each transaction and the number of times it appears,
+            as returned by encode_dataset.
+        n_items (int): Number of item ids.
+
+    Returns:
+        list: The tidset of each item id.
+    """
+    tids = [[] for _ in range(n_items)]
+    n_transactions = 0
+    for items, count in transactions:
+        transaction_ids = range(n_transactions, n_transactions + count)
+        for item in items:
+            tids[item].extend(transaction_ids)
+        n_transactions += count
+
+    # The bits are set in a buffer and converted at once, since every OR on an integer would copy it
+    tidsets = []
+    for item_tids in tids:
+        bits = bytearray((n_transactions + 7) // 8)
+        for tid in item_tids:
+            bits[tid >> 3] |= 1 << (tid & 7)
+        tidsets.append(int.from_bytes(bits, "little"))
+    return tidsets
+
+
+def _eclat_recursive(prefix: tuple, members: list, minimum_support: int, frequent_itemsets: dict, diffsets: bool,
+                     tidsets: bool = True):
+    """
+    Private recursive implementation of Eclat and dEclat.
+
+    The members of an equivalence class share the prefix, and each of them is extended with the members that
+    follow it. With diffsets, each member holds the transactions of the prefix that do not contain it instead
+    of its tidset: d(XY) = t(X) - t(Y) for the first level and d(PXY) = d(PY) - d(PX) for the next ones, and
+    support(PXY) = support(PX) - |d(PXY)|.
+
+    Arguments:
+        prefix (tuple): Item ids shared by the itemsets of the class.
+        members (list): Triples with the item id, the tidset (or diffset) and the support of each member.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        frequent_itemsets (dict): Dictionary of the frequent itemsets.
+        diffsets (bool): Whether the next levels are mined with diffsets (dEclat) instead of tidsets.
+        tidsets (bool): Whether the members hold tidsets, as in the first level (default=True).
+    """
+    for i, (item, bits, support) in enumerate(members):
+        itemset = prefix + (item,)
+        frequent_itemsets[itemset] = support
+
+        extensions = []
+        for other, other_bits, _ in members[i + 1:]:
+            if not diffsets:
+                new_bits = bits & other_bits
+                new_support = _popcount(new_bits)
+            else:
+                new_bits = bits & ~other_bits if tidsets else other_bits & ~bits
+                new_support = support - _popcount(new_bits)
+            if new_support >= minimum_support:
+                extensions.append((other, new_bits, new_support))
+
+        if extensions:
+            _eclat_recursive(itemset, extensions, minimum_support, frequent_itemsets, diffsets, tidsets=False)
+
+
+def _vertical_mining(tidsets: list, item_support: dict, minimum_support: int, diffsets: bool):
+    """
+    Mines the frequent itemsets from the tidsets of the frequent items.
+
+    The items are extended in ascending order of support, which keeps the classes small, and each item is
+    extended with the more frequent ones, so the items of each itemset are in descending order of id.
+
+    Arguments:
+        tidsets (list): The tidset of each item id.
+        item_support (dict): Dictionary with the support of each frequent item id.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        diffsets (bool): Whether to mine with diffsets (dEclat) instead of tidsets (Eclat).
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys.
+    """
+    frequent_itemsets = {}
+    members = [(item, tidsets[item], item_support[item]) for item in sorted(item_support, reverse=True)]
+    _eclat_recursive((), members, minimum_support, frequent_itemsets, diffsets)
+    return frequent_itemsets
+
+
+def choose_engine(scan_summary: dict):
+    """
+    Chooses the engine for mining a dataset from the summary of its first scan.
+
+    Arguments:
+        scan_summary (dict): Summary of the first scan of the dataset, as filled by encode_dataset.
+
+    Returns:
+        str: "eclat" if the density of the dataset reaches DENSITY_THRESHOLD, and "fp-growth" otherwise.
+    """
+    # Integers take as many bits as their highest bit set, so diffsets are rarely smaller than tidsets
+    return "eclat" if scan_summary["density"] >= DENSITY_THRESHOLD else "fp-growth"
+
+
+def eclat(dataset, minimum_support: int = 1, is_header: bool = True, diffsets: bool = False, weighted: bool = False):
+    """
+    Mines the frequent itemsets of a dataset with Eclat, or with dEclat if `diffsets` is True.
+
+    Arguments:
+        dataset (list): Dataset in any of the formats accepted by fp_tree_construction.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1).
+        is_header (bool): Boolean flag indicating whether the dataset includes a header in the first row.
+        diffsets (bool): Whether to intersect diffsets instead of tidsets, which are smaller for dense
+            datasets (default=False).
+        weighted (bool): Boolean flag indicating whether each transaction is given as a (transaction, count)
+            pair (default=False).
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys, as
+            returned by fp_growth.
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids.
+    """
+    engine = "declat" if diffsets else "eclat"
+    return mine_frequent_itemsets(dataset, minimum_support, is_header, engine, weighted=weighted)
+
+
+def mine_frequent_itemsets(dataset, minimum_support: int = 1, is_header: bool = True, engine: str = "auto",
+                           backend: str = "node", workers: int = 1, weighted: bool = False, scan_summary: dict = None,
+                           sparse: bool = None):
+    """
+    Mines the frequent itemsets of a dataset with FP-Growth, Eclat or dEclat.
+
+    The dataset is scanned once for the supports of the items, and then once more for building either the
+    FP-tree or the tidsets. With "auto", the engine is chosen by the density measured in the first scan.
+
+    Arguments:
+        dataset (list): Dataset in any of the formats accepted by fp_tree_construction.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1).
+        is_header (bool): Boolean flag indicating whether the dataset includes a header in the first row.
+        engine (str): One of ENGINES (default="auto").
+        backend (str): Storage used for the FP-tree (default="node").
+        workers (int): Number of processes of FP-Growth (default=1).
+        weighted (bool): Boolean flag indicating whether each transaction is given as a (transaction, count)
+            pair (default=False).
+        scan_summary (dict): Dictionary where the summary of the first scan and the engine used are stored,
+            if it is given (default=None).
+        sparse (bool): Whether the transactions are lists of items (True) or binary rows (False). It is
+            guessed from the dataset if it is None (see encode_dataset) (default=None).
+
+    Returns:
+        frequent_itemsets (dict): Dictionary of the frequent itemsets, with tuples of item ids as keys.
+        item_dictionary (ItemDictionary): Dictionary for decoding the item ids.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown mining engine: {engine}")
+    if backend != "array" and backend not in NODE_BACKENDS:
+        raise ValueError(f"Unknown FP-tree backend: {backend}")
+
+    # First scan
+    if scan_summary is None:
+        scan_summary = {}
+    item_dictionary, item_support, transactions = encode_dataset(dataset, minimum_support, is_header, weighted,
+                                                                 scan_summary=scan_summary, sparse=sparse)
+    if engine == "auto":
+        engine = choose_engine(scan_summary)
+    scan_summary["engine"] = engine
+
+    # Second scan
+    if engine == "fp-growth":
+        _, header_table = build_tree(transactions, item_support, backend, item_dictionary)
+        return fp_growth(header_table, minimum_support, workers), item_dictionary
+
+    if isinstance(dataset, BinaryMatrix):
+        tidsets = _matrix_tidsets(dataset, item_dictionary.names)
+    else:
+        tidsets = _transaction_tidsets(transactions, len(item_dictionary))
+    return _vertical_mining(tidsets, item_support, minimum_support, engine == "declat"), item_dictionary
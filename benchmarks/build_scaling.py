@@ -0,0 +1,74 @@
+"""
+Regression benchmark checking that the FP-tree build time grows linearly with the number of transactions.
+
+To execute it use `python -m benchmarks.build_scaling [--transactions N] [--steps S] [--tolerance T]`.
+The script exits with an error when the time per transaction of the largest dataset exceeds the one of
+the smallest dataset by more than the tolerance factor.
+"""
+import argparse
+import gc
+import sys
+import time
+
+from algorithms import fp_tree_construction
+from benchmarks.tree_backends import synthetic_dataset
+
+
+def build_time(dataset, minimum_support: int, backend: str, repeat: int = 3):
+    """
+    Returns the best build time of the FP-tree over several repetitions.
+
+    The cyclic garbage collector is disabled while the tree is built. Otherwise its passes walk the whole
+    growing tree, and the time per transaction grows with the size of the dataset regardless of the build.
+
+    Arguments:
+        dataset (list): Dataset with the header in the first row.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): FP-tree backend to evaluate.
+        repeat (int): Number of repetitions (default=3).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fp_tree_construction(dataset, minimum_support, backend=backend)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the FP-tree build time is linear in the number of transactions.")
+    parser.add_argument("--transactions", type=int, default=2000, help="Number of transactions of the smallest dataset.")
+    parser.add_argument("--steps", type=int, default=4, help="Number of times the dataset size is doubled.")
+    parser.add_argument("--items", type=int, default=200, help="Number of different items.")
+    parser.add_argument("--density", type=float, default=0.2, help="Average fraction of items per transaction.")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Maximum allowed growth of the time per transaction.")
+    parser.add_argument("--backends", nargs="+", default=["node", "slots", "array"], help="Backends to evaluate.")
+    args = parser.parse_args()
+
+    sizes = [args.transactions * 2**step for step in range(args.steps + 1)]
+    largest = synthetic_dataset(sizes[-1], args.items, args.density)
+
+    failed = False
+    print(f"{'backend':<8} {'transactions':>12} {'time (s)':>10} {'us/transaction':>15}")
+    for backend in args.backends:
+        per_transaction = []
+        for size in sizes:
+            elapsed = build_time(largest[:size + 1], 1, backend)
+            per_transaction.append(elapsed / size)
+            print(f"{backend:<8} {size:>12} {elapsed:>10.3f} {per_transaction[-1] * 1e6:>15.2f}")
+
+        growth = per_transaction[-1] / per_transaction[0]
+        if growth > args.tolerance:
+            print(f"{backend}: time per transaction grew {growth:.2f} times (tolerance {args.tolerance})")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
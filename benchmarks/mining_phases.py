@@ -0,0 +1,187 @@
+"""
+Benchmark timing and memory-profiling each phase of the mining separately, over a sweep of minimum supports.
+
+The phases are loading the dataset, the first scan, the construction of the FP-tree, FP-Growth and the search
+of the closed and maximal itemsets. A synthetic dataset is generated with benchmarks.quest_generator, unless
+a basket file is given, and the results are written to a CSV or JSON Lines file for comparing runs.
+
+To execute it use
+`python -m benchmarks.mining_phases [--supports S ...] [--backends B ...] [--output results.csv] [--baseline old.csv]`.
+The script exits with an error when the total time of a run exceeds the one of the baseline by more than the
+tolerance factor.
+"""
+import argparse
+import csv
+import gc
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from algorithms import build_tree, encode_dataset, find_closed_maximal, fp_growth
+from benchmarks.quest_generator import quest_dataset, write_baskets
+from utils.loaders import BasketTransactions
+from utils.sinks import open_sink
+
+
+# Phases of the mining, in the order they run
+PHASES = ("load", "first_scan", "build", "fp_growth", "closed_maximal")
+
+# Fields of each result, with the time in seconds and the peak memory in MiB of every phase
+RESULT_FIELDS = (("backend", "min_support", "frequent", "closed", "maximal", "total_time")
+                 + tuple(f"{phase}_{measure}" for phase in PHASES for measure in ("time", "peak")))
+
+
+def run_phases(file_path: str, minimum_support: int, backend: str, trace_memory: bool = True):
+    """
+    Mines a basket file measuring each phase.
+
+    The memory of a phase is the peak of the memory allocated while it runs, traced with tracemalloc, which
+    also slows it down. Its time is only meaningful when `trace_memory` is False.
+
+    Arguments:
+        file_path (str): Path of the basket file.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): FP-tree backend to evaluate.
+        trace_memory (bool): Whether to trace the memory of the phases (default=True).
+
+    Returns:
+        measures (dict): Time in seconds and peak memory in MiB (or None) of each phase.
+        counts (dict): Number of frequent, closed and maximal itemsets.
+    """
+    measures = {}
+
+    def phase(name, function, *args, **kwargs):
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        measures[name] = {"time": elapsed, "peak": peak}
+        return result
+
+    dataset = phase("load", lambda: list(BasketTransactions(file_path)))
+    # The list of transactions loses the sparse marker of the loader, so numeric items are not taken as binary rows
+    item_dictionary, item_support, transactions = phase("first_scan", encode_dataset, dataset, minimum_support, False,
+                                                        sparse=True)
+    _, header_table = phase("build", build_tree, transactions, item_support, backend, item_dictionary)
+    frequent_itemsets = phase("fp_growth", fp_growth, header_table, minimum_support)
+    closed, maximal = phase("closed_maximal", find_closed_maximal, frequent_itemsets, False)
+
+    counts = {"frequent": len(frequent_itemsets), "closed": len(closed), "maximal": len(maximal)}
+    return measures, counts
+
+
+def benchmark(file_path: str, minimum_support: int, backend: str, repeat: int = 1, trace_memory: bool = True):
+    """
+    Measures the phases of the mining of a basket file, keeping the best time of each phase over several
+    repetitions. The memory is traced in a separate run, so it does not slow down the timed ones.
+
+    Arguments:
+        file_path (str): Path of the basket file.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): FP-tree backend to evaluate.
+        repeat (int): Number of timed repetitions (default=1).
+        trace_memory (bool): Whether to measure the peak memory of the phases (default=True).
+
+    Returns:
+        dict: The result, with the fields of RESULT_FIELDS.
+    """
+    result = {"backend": backend, "min_support": minimum_support}
+    for _ in range(repeat):
+        measures, counts = run_phases(file_path, minimum_support, backend, trace_memory=False)
+        for name in PHASES:
+            best = result.get(f"{name}_time", math.inf)
+            result[f"{name}_time"] = min(best, measures[name]["time"])
+    result.update(counts)
+    result["total_time"] = sum(result[f"{name}_time"] for name in PHASES)
+
+    measures = run_phases(file_path, minimum_support, backend, trace_memory=True)[0] if trace_memory else {}
+    for name in PHASES:
+        result[f"{name}_peak"] = measures[name]["peak"] if trace_memory else None
+    return result
+
+
+def read_results(file_path: str):
+    """
+    Reads the results written by a previous run, as a CSV or JSON Lines file.
+
+    Arguments:
+        file_path (str): Path of the file.
+
+    Returns:
+        dict: The total time of each result, keyed by its backend and minimum support.
+    """
+    with open(file_path, mode="r", encoding="utf-8", newline="") as file:
+        if file_path.endswith((".jsonl", ".json")):
+            records = [json.loads(line) for line in file if line.strip()]
+        else:
+            records = list(csv.DictReader(file))
+    return {(record["backend"], int(record["min_support"])): float(record["total_time"]) for record in records}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile each phase of the mining over several minimum supports.")
+    parser.add_argument("--dataset", default=None, help="Basket file to mine. A synthetic dataset is generated by default.")
+    parser.add_argument("--transactions", type=int, default=10000, help="Number of transactions of the synthetic dataset.")
+    parser.add_argument("--items", type=int, default=100, help="Number of different items of the synthetic dataset.")
+    parser.add_argument("--length", type=float, default=10, help="Average number of items per transaction.")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Average fraction of items per transaction. Replaces --length if it is given.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parser.add_argument("--supports", type=float, nargs="+", default=[0.05, 0.02, 0.01],
+                        help="Minimum supports to sweep, as fractions of the transactions (or counts if 1 or more).")
+    parser.add_argument("--backends", nargs="+", default=["node", "slots", "array"], help="Backends to evaluate.")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of timed repetitions of each run.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the memory profiling of the phases.")
+    parser.add_argument("--output", default=None, help="CSV or JSON Lines file where the results are written.")
+    parser.add_argument("--baseline", default=None, help="Results of a previous run to compare the total times with.")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Maximum allowed slowdown with respect to the baseline.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = args.dataset
+        if file_path is None:
+            file_path = os.path.join(temp_dir, "quest.txt")
+            write_baskets(quest_dataset(args.transactions, args.items, args.length, args.density, seed=args.seed),
+                          file_path)
+        n_transactions = sum(1 for _ in BasketTransactions(file_path))
+        supports = [int(support) if support >= 1 else max(1, math.ceil(support * n_transactions))
+                    for support in args.supports]
+
+        results = []
+        print(f"{'backend':<8} {'support':>8} {'itemsets':>9} " + " ".join(f"{name:>14}" for name in PHASES))
+        for backend in args.backends:
+            for support in supports:
+                result = benchmark(file_path, support, backend, args.repeat, not args.no_memory)
+                results.append(result)
+                print(f"{backend:<8} {support:>8} {result['frequent']:>9} "
+                      + " ".join(f"{result[f'{name}_time']:>14.3f}" for name in PHASES))
+
+    if args.output is not None:
+        with open_sink(args.output, fields=RESULT_FIELDS) as sink:
+            sink.write_all(tuple(result[field] for field in RESULT_FIELDS) for result in results)
+
+    failed = False
+    if args.baseline is not None:
+        baseline = read_results(args.baseline)
+        for result in results:
+            previous = baseline.get((result["backend"], result["min_support"]))
+            if previous is not None and result["total_time"] > args.tolerance * previous:
+                print(f"{result['backend']} at support {result['min_support']}: {result['total_time']:.3f} s, "
+                      f"baseline {previous:.3f} s (tolerance {args.tolerance})")
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
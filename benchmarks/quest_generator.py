@@ -0,0 +1,160 @@
+"""
+Seeded generator of synthetic basket datasets in the style of the IBM Quest generator (Agrawal and Srikant, 1994).
+
+Transactions are filled with potentially frequent itemsets (patterns) drawn from a fixed pool, so the datasets
+contain long frequent itemsets as real market data does, instead of independent items.
+
+To write a dataset as a basket file use
+`python -m benchmarks.quest_generator file_path [--transactions N] [--items M] [--length T] [--density D]`.
+"""
+import argparse
+import bisect
+import math
+import random
+
+
+def _poisson(rng: random.Random, mean: float):
+    """
+    Draws a value of a Poisson distribution. Large means use the normal approximation.
+
+    Arguments:
+        rng (random.Random): Random generator.
+        mean (float): Mean of the distribution.
+    """
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit = math.exp(-mean)
+    value, product = 0, rng.random()
+    while product > limit:
+        value += 1
+        product *= rng.random()
+    return value
+
+
+def _patterns(rng: random.Random, n_items: int, n_patterns: int, pattern_length: float, correlation: float):
+    """
+    Generates the pool of patterns with their weights and corruption levels.
+
+    Each pattern takes a fraction of its items from the previous one, drawn from an exponential distribution
+    with mean `correlation`, and the rest at random.
+
+    Arguments:
+        rng (random.Random): Random generator.
+        n_items (int): Number of different items.
+        n_patterns (int): Number of patterns.
+        pattern_length (float): Average number of items of the patterns.
+        correlation (float): Average fraction of items shared with the previous pattern.
+
+    Returns:
+        patterns (list): The items of each pattern.
+        cumulative (list): Cumulative probability of picking each pattern.
+        corruption (list): Probability of dropping each item of each pattern when it is added to a transaction.
+    """
+    patterns = []
+    previous = []
+    for _ in range(n_patterns):
+        size = min(n_items, max(1, _poisson(rng, pattern_length - 1) + 1))
+        shared = min(len(previous), int(min(1.0, rng.expovariate(1 / correlation)) * size)) if previous else 0
+        pattern = set(rng.sample(previous, shared))
+        while len(pattern) < size:
+            pattern.add(rng.randrange(n_items))
+        previous = list(pattern)
+        patterns.append(previous)
+
+    weights = [rng.expovariate(1) for _ in range(n_patterns)]
+    total = sum(weights)
+    cumulative, accumulated = [], 0.0
+    for weight in weights:
+        accumulated += weight / total
+        cumulative.append(accumulated)
+
+    corruption = [min(1.0, max(0.0, rng.gauss(0.5, math.sqrt(0.1)))) for _ in range(n_patterns)]
+    return patterns, cumulative, corruption
+
+
+def quest_dataset(n_transactions: int, n_items: int, average_length: float = 10, density: float = None,
+                  n_patterns: int = None, pattern_length: float = 4, correlation: float = 0.5, seed: int = 0):
+    """
+    Generates a synthetic basket dataset. The same arguments and seed always give the same dataset.
+
+    The length of each transaction is drawn from a Poisson distribution, and the transaction is filled with
+    patterns picked by weight. Each item of a picked pattern is dropped with the corruption level of the
+    pattern, and a pattern that does not fit is still added half of the times.
+
+    Arguments:
+        n_transactions (int): Number of transactions.
+        n_items (int): Number of different items.
+        average_length (float): Average number of items of the transactions (default=10).
+        density (float): Average fraction of the items present in a transaction. It replaces `average_length`
+            if it is given (default=None).
+        n_patterns (int): Number of patterns of the pool. It is 10 times the number of items, up to 2000,
+            if it is None (default=None).
+        pattern_length (float): Average number of items of the patterns (default=4).
+        correlation (float): Average fraction of items that a pattern shares with the previous one (default=0.5).
+        seed (int): Seed of the random generator (default=0).
+
+    Returns:
+        list: Dataset in sparse format, with the list of item names of each transaction and no header.
+    """
+    if density is not None:
+        average_length = density * n_items
+    if n_patterns is None:
+        n_patterns = min(2000, 10 * n_items)
+
+    rng = random.Random(seed)
+    patterns, cumulative, corruption = _patterns(rng, n_items, n_patterns, pattern_length, correlation)
+    names = [f"item{i}" for i in range(n_items)]
+
+    dataset = []
+    for _ in range(n_transactions):
+        size = min(n_items, _poisson(rng, average_length))
+        transaction = set()
+        # The picks are bounded, since the patterns may not cover enough items
+        for _ in range(4 * size):
+            if len(transaction) >= size:
+                break
+            index = min(n_patterns - 1, bisect.bisect_right(cumulative, rng.random()))
+            items = [item for item in patterns[index] if rng.random() >= corruption[index]]
+            if len(transaction) + len(items) > size and transaction and rng.random() < 0.5:
+                break
+            transaction.update(items)
+        dataset.append([names[item] for item in sorted(transaction)])
+    return dataset
+
+
+def write_baskets(dataset, file_path: str, delimiter: str = " "):
+    """
+    Writes a dataset in sparse format as a basket file, with the items of one transaction per line.
+
+    Arguments:
+        dataset (list): Dataset in sparse format.
+        file_path (str): Path of the file.
+        delimiter (str): Character separating the items (default=" ").
+    """
+    with open(file_path, mode="w", encoding="utf-8") as file:
+        for transaction in dataset:
+            file.write(delimiter.join(transaction))
+            file.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic basket dataset in the style of IBM Quest.")
+    parser.add_argument("file_path", help="Path of the basket file.")
+    parser.add_argument("--transactions", type=int, default=10000, help="Number of transactions.")
+    parser.add_argument("--items", type=int, default=100, help="Number of different items.")
+    parser.add_argument("--length", type=float, default=10, help="Average number of items per transaction.")
+    parser.add_argument("--density", type=float, default=None,
+                        help="Average fraction of items per transaction. Replaces --length if it is given.")
+    parser.add_argument("--patterns", type=int, default=None, help="Number of potentially frequent itemsets.")
+    parser.add_argument("--pattern-length", type=float, default=4, help="Average number of items per pattern.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    args = parser.parse_args()
+
+    dataset = quest_dataset(args.transactions, args.items, args.length, args.density, args.patterns,
+                            args.pattern_length, seed=args.seed)
+    write_baskets(dataset, args.file_path)
+    print(f"{len(dataset)} transactions written to {args.file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark comparing the memory and build time of the FP-tree backends.
+
+To execute it use `python -m benchmarks.tree_backends [--transactions N] [--items M] [--density D]`.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from algorithms import fp_tree_construction
+
+
+def synthetic_dataset(n_transactions: int, n_items: int, density: float, seed: int = 0):
+    """
+    Generates a random dataset in binary format with a header row.
+
+    The probability of each item decreases with its position, so that the resulting tree shares
+    prefixes in the same way as real basket data.
+
+    Arguments:
+        n_transactions (int): Number of transactions.
+        n_items (int): Number of different items.
+        density (float): Average fraction of items present in a transaction.
+        seed (int): Seed of the random generator (default=0).
+
+    Returns:
+        list: Dataset with the header in the first row.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(n_items)]
+    scale = density * n_items / sum(weights)
+    probabilities = [min(1.0, weight * scale) for weight in weights]
+
+    dataset = [[f"item{i}" for i in range(n_items)]]
+    for _ in range(n_transactions):
+        dataset.append([1 if rng.random() < p else 0 for p in probabilities])
+    return dataset
+
+
+def measure(dataset, minimum_support: int, backend: str):
+    """
+    Builds the FP-tree with the given backend measuring its build time and memory.
+
+    Arguments:
+        dataset (list): Dataset with the header in the first row.
+        minimum_support (int): The minimum support threshold to determine frequent itemsets.
+        backend (str): FP-tree backend to evaluate.
+
+    Returns:
+        dict: Build time in seconds, and retained and peak memory in MiB.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree, header_table = fp_tree_construction(dataset, minimum_support, backend=backend)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree, header_table
+
+    return {
+        "backend": backend,
+        "time": elapsed,
+        "memory": current / 2**20,
+        "peak": peak / 2**20
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory and build time of the FP-tree backends.")
+    parser.add_argument("--transactions", type=int, default=10000, help="Number of transactions.")
+    parser.add_argument("--items", type=int, default=60, help="Number of different items.")
+    parser.add_argument("--density", type=float, default=0.15, help="Average fraction of items per transaction.")
+    parser.add_argument("--min-support", type=int, default=1, help="Minimum support used to build the tree.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    args = parser.parse_args()
+
+    dataset = synthetic_dataset(args.transactions, args.items, args.density, args.seed)
+    print(f"{'backend':<8} {'time (s)':>10} {'memory (MiB)':>14} {'peak (MiB)':>12}")
+    for backend in ("node", "slots", "array"):
+        result = measure(dataset, args.min_support, backend)
+        print(f"{result['backend']:<8} {result['time']:>10.3f} {result['memory']:>14.2f} {result['peak']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,47 +2,282 @@
 Main script for frequent itemsets mining.
 
 To execute it use `python frequent_itemset_mining.py file_path min_support`.
+Datasets with the items of one transaction per line can be mined with `--format baskets`.
+The dataset is read twice from disk and never loaded in memory, and it can be compressed with gzip.
+Binary datasets can be loaded as a NumPy matrix with `--numpy`, if NumPy is installed.
+Only the closed or the maximal itemsets can be mined directly with `--mode closed` or `--mode maximal`.
+The K itemsets with the highest support can be mined with `--top-k K`, in which case min_support is optional.
+The FP-tree can be stored with `--save-tree PATH`, and mined again later with `--load-tree` and the path as file_path.
+With `--cache DIR`, the results are cached, and later runs with a higher min_support filter them instead of mining.
+The itemsets can be written to a CSV or JSON Lines file with `--output PATH` as they are found, instead of printed.
+Association rules are generated with `--rules`, and written to the output file instead of the itemsets if it is given.
+The frequent itemsets can be mined with Eclat or dEclat instead of FP-Growth with `--engine`, or chosen by density with `--engine auto`.
+With `--profile PATH`, the statistics of the run (tree sizes, conditional trees and time of each phase) are written as JSON.
 """
-import csv
+import argparse
 import sys
-from algorithms import fp_tree_construction, find_closed_maximal, fp_growth, sort_frequent_itemsets
+from algorithms import (fp_tree_construction, find_closed_maximal, fp_growth, iter_fp_growth, fp_close, fp_max,
+                        fp_growth_top_k, partitioned_fp_growth, sort_frequent_itemsets, mine_frequent_itemsets,
+                        encode_dataset)
+from algorithms.fp_tree_storage import load_fp_tree, save_fp_tree
+from algorithms.result_cache import ResultCache, dataset_fingerprint
+from algorithms.association_rules import RULE_FIELDS, iter_association_rules
+from algorithms.vertical_mining import ENGINES
+from algorithms.mining_stats import MiningStats
+from utils.binary_matrix import NUMPY_AVAILABLE, load_binary_matrix
+from utils.loaders import DEFAULT_BUFFER_SIZE, BasketTransactions, CSVTransactions
+from utils.sinks import SINKS, external_sort, open_sink
 
 
 # Error pruning
-if len(sys.argv) != 3: # The name of the file is taken as an argument
-    raise ValueError("Not enough parameters provided!")
+parser = argparse.ArgumentParser(description="Mine the frequent, closed and maximal itemsets of a dataset.")
+parser.add_argument("file_path", help="Path of the dataset.")
+parser.add_argument("min_support", type=int, nargs="?", default=None,
+                    help="Minimum support to consider an itemset frequent. Optional with --top-k.")
+parser.add_argument("--format", choices=["csv", "baskets"], default="csv",
+                    help="CSV file with a header row, or basket file with the items of one transaction per line.")
+parser.add_argument("--delimiter", default=None,
+                    help="Item delimiter. Detected for CSV files and any whitespace for basket files by default.")
+parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE,
+                    help="Size in bytes of the buffer used for reading the dataset.")
+parser.add_argument("--numpy", action="store_true",
+                    help="Load binary CSV datasets as a NumPy matrix. Ignored if NumPy is not installed.")
+parser.add_argument("--mmap", default=None,
+                    help="Path of a .npy file where the NumPy matrix is memory-mapped instead of kept in memory.")
+parser.add_argument("--workers", type=int, default=1,
+                    help="Number of processes mining the conditional pattern bases (or the shards) in parallel.")
+parser.add_argument("--partitions", type=int, default=0,
+                    help="Number of item groups for mining the dataset in shards. The whole tree is built if 0.")
+parser.add_argument("--shard-dir", default=None,
+                    help="Directory for the shard files. A temporary directory is used by default.")
+parser.add_argument("--mode", choices=["all", "closed", "maximal"], default="all",
+                    help="Mine the frequent, closed and maximal itemsets, or only the closed or the maximal ones.")
+parser.add_argument("--save-tree", default=None, help="Path of a file where the FP-tree is stored after building it.")
+parser.add_argument("--load-tree", action="store_true",
+                    help="Read file_path as an FP-tree stored with --save-tree instead of as a dataset.")
+parser.add_argument("--cache", default=None,
+                    help="Directory of the result cache. Results at a higher min_support are filtered from it.")
+parser.add_argument("--output", default=None,
+                    help="Path of a file (or - for stdout) where the itemsets of the mode are written instead of printed. "
+                         "With --mode all, only the frequent itemsets are written, as they are found.")
+parser.add_argument("--output-format", choices=sorted(SINKS), default=None,
+                    help="Format of the output file. Taken from its extension by default.")
+parser.add_argument("--sort", action="store_true",
+                    help="Sort the itemsets of the output file, with an external sort that spills to temporary files.")
+parser.add_argument("--rules", action="store_true", help="Generate the association rules of the frequent itemsets.")
+parser.add_argument("--min-confidence", type=float, default=0.5, help="Minimum confidence of the association rules.")
+parser.add_argument("--min-lift", type=float, default=None, help="Minimum lift of the association rules.")
+parser.add_argument("--min-leverage", type=float, default=None, help="Minimum leverage of the association rules.")
+parser.add_argument("--top-k", type=int, default=None,
+                    help="Mine only the K itemsets with the highest support, raising the minimum support as they are found.")
+parser.add_argument("--min-length", type=int, default=1, help="Minimum number of items of the top-k itemsets.")
+parser.add_argument("--max-length", type=int, default=None, help="Maximum number of items of the top-k itemsets.")
+parser.add_argument("--engine", choices=ENGINES, default="fp-growth",
+                    help="Algorithm for mining the frequent itemsets. auto uses Eclat for dense datasets and FP-Growth otherwise.")
+parser.add_argument("--profile", default=None,
+                    help="Path of a JSON file where the statistics of the tree construction and the mining are written.")
+args = parser.parse_args()
+if args.top_k is None:
+    if args.min_support is None:
+        parser.error("min_support is required unless --top-k is given.")
+    if args.min_length != 1 or args.max_length is not None:
+        parser.error("--min-length and --max-length can only be used with --top-k.")
+elif args.mode != "all" or args.partitions > 0:
+    parser.error("--top-k cannot be used with --mode or --partitions.")
+if args.partitions > 0 and (args.save_tree or args.load_tree):
+    parser.error("--partitions does not build a single FP-tree to save or load.")
+if args.mode != "all" and args.partitions > 0:
+    parser.error("--partitions can only be used with --mode all.")
+if args.sort and args.output is None:
+    parser.error("--sort can only be used with --output.")
+if args.rules and (args.mode != "all" or args.top_k is not None or args.load_tree):
+    parser.error("--rules needs all the frequent itemsets and the dataset: it cannot be used with --mode, --top-k or --load-tree.")
+if args.engine != "fp-growth" and (args.mode != "all" or args.top_k is not None or args.partitions > 0
+                                   or args.save_tree or args.load_tree):
+    parser.error("--engine only mines all the frequent itemsets of a dataset: it cannot be used with --mode, --top-k, "
+                 "--partitions, --save-tree or --load-tree.")
 
-file_path = sys.argv[1]
-min_support = int(sys.argv[2]) # Sys arguments are strings by default
+file_path = args.file_path
+# With --top-k, the minimum support is only a lower bound
+min_support = args.min_support if args.min_support is not None else 1
+# The statistics are only collected with --profile, so the mining is not slowed down otherwise
+stats = MiningStats() if args.profile is not None else None
+# Summary of the first scan of the dataset, like the number of transactions needed by --rules. Unlike the
+# --profile statistics, it is always filled
+scan_summary = {}
+
+
+#################### RESULT CACHE ####################
+# The results of the same dataset at a lower min_support are filtered instead of mining again
+cache = None
+cached = None
+if args.cache is not None and args.top_k is None:
+    cache = ResultCache(cache_dir=args.cache)
+    fingerprint = dataset_fingerprint(file_path, args.format, args.delimiter, args.load_tree)
+    cached = cache.lookup(fingerprint, min_support)
+    if cached is not None:
+        n_transactions = cache.cached_transactions(fingerprint)
+        if n_transactions is not None:
+            scan_summary["transactions"] = n_transactions
+        print(f"CACHE HIT: filtered from min_support {cache.cached_support(fingerprint)}", file=sys.stderr)
+    else:
+        print("CACHE MISS", file=sys.stderr)
+if stats is not None:
+    stats.lap("cache")
 
 
 #################### LOADING THE DATA SET ####################
-dataset = []
-with open(file_path, mode="r") as file:
-    # Get the delimiter used in the dataset using the Sniffer class of the CSV internal library
-    sample = file.read(1024)
-    dialect = csv.Sniffer().sniff(sample)
-    delimiter = dialect.delimiter
+# The transactions of basket files are lists of items, even if the items are numbers like 0 and 1.
+# The format of CSV files is guessed from their first transaction
+sparse = True if args.format == "baskets" else None
+# The dataset is streamed from disk in each scan of the tree construction instead of being loaded in memory
+if cached is not None and (not args.rules or "transactions" in scan_summary):
+    # The results are taken from the cache, so the dataset is not read
+    dataset = None
+elif args.load_tree:
+    # A stored tree is memory-mapped, so both the parsing of the dataset and the construction are skipped
+    fp_tree, header_table, tree_support = load_fp_tree(file_path)
+    if args.min_support is None:
+        min_support = tree_support
+    elif min_support < tree_support:
+        parser.error(f"The tree was built with a minimum support of {tree_support}, it cannot be mined below it.")
+elif args.format == "baskets":
+    # Basket files are kept in sparse format, so they need no header
+    dataset = BasketTransactions(file_path, args.delimiter, args.buffer_size)
+    is_header = False
+elif args.numpy and NUMPY_AVAILABLE:
+    # Binary datasets are loaded as a matrix, and the transactions are sorted in bulk
+    dataset = load_binary_matrix(file_path, args.delimiter, args.mmap, args.buffer_size)
+    is_header = False
+else:
+    if args.numpy:
+        print("NumPy is not installed. Using the pure Python loader.", file=sys.stderr)
+    dataset = CSVTransactions(file_path, args.delimiter, args.buffer_size)
+    is_header = True
+if stats is not None:
+    stats.lap("load")
 
-    # Reset CSV pointer
-    file.seek(0)
 
-    # Read the dataset
-    csv_reader = csv.reader(file, delimiter=delimiter)
-    header = next(csv_reader)
-    dataset.append(header)
-    for row in csv_reader:
-        dataset.append(row)
+#################### FP-TREE CONSTRUCTION ####################
+if cached is None and not args.load_tree and args.partitions == 0 and args.engine == "fp-growth":
+    fp_tree, header_table = fp_tree_construction(dataset, min_support, is_header, stats=stats, sparse=sparse,
+                                                scan_summary=scan_summary)
+    if args.save_tree is not None:
+        save_fp_tree(args.save_tree, fp_tree, header_table, min_support)
+if stats is not None:
+    stats.lap("construction")
 
 
 #################### FP-GROWTH ALGORITHM ####################
-_, header_table = fp_tree_construction(dataset, min_support)
-frequent_itemsets = fp_growth(header_table, min_support)
-frequent_itemsets = sort_frequent_itemsets(frequent_itemsets)
-print(f"FREQUENT ITEMSETS: {frequent_itemsets}")
+# Itemsets written to the output file as they are found, without the frequent_itemsets dictionary
+found_itemsets = None
+if cached is not None:
+    frequent_itemsets, item_dictionary = cached
+elif args.top_k is not None:
+    # The minimum support is raised during the mining as the best itemsets are found
+    top_itemsets = fp_growth_top_k(header_table, args.top_k, min_support, args.min_length, args.max_length)
+    item_dictionary = header_table.item_dictionary
+elif args.mode != "all" and cache is None:
+    # The closed or maximal itemsets are mined directly from the tree, without the rest of frequent itemsets
+    item_dictionary = header_table.item_dictionary
+elif args.partitions > 0:
+    # The dataset is split into shards that are mined independently, so no tree holds the whole dataset
+    frequent_itemsets, item_dictionary = partitioned_fp_growth(dataset, min_support, is_header, args.partitions,
+                                                               args.workers, args.shard_dir, sparse=sparse,
+                                                               scan_summary=scan_summary)
+elif args.engine != "fp-growth":
+    # The engine builds the tidsets (or the FP-tree, with auto) after its own first scan
+    frequent_itemsets, item_dictionary = mine_frequent_itemsets(dataset, min_support, is_header, args.engine,
+                                                                workers=args.workers, scan_summary=scan_summary,
+                                                                sparse=sparse)
+    print(f"ENGINE: {scan_summary['engine']} (density {scan_summary['density']:.4f})", file=sys.stderr)
+elif args.output is not None and not args.rules and cache is None and args.workers == 1:
+    found_itemsets = iter_fp_growth(header_table, min_support, stats=stats)
+    item_dictionary = header_table.item_dictionary
+else:
+    frequent_itemsets = fp_growth(header_table, min_support, args.workers, stats=stats)
+    item_dictionary = header_table.item_dictionary
+
+if cache is not None and cached is None:
+    cache.store(fingerprint, min_support, frequent_itemsets, item_dictionary, scan_summary.get("transactions"))
+if stats is not None:
+    # The itemsets written as they are found are mined in the results phase
+    stats.lap("mining")
 
 
 #################### CLOSED AND MAXIMAL ITEMSETS ####################
-closed, maximal = find_closed_maximal(frequent_itemsets)
-print(f"CLOSED ITEMSETS: {closed}")
-print(f"MAXIMAL ITEMSETS: {maximal}")
\ No newline at end of file
+# The top-k itemsets are not filtered
+if cache is not None:
+    closed, maximal = cache.closed_maximal(fingerprint, min_support)
+elif args.mode == "closed":
+    closed = fp_close(header_table, min_support)
+elif args.mode == "maximal":
+    maximal = fp_max(header_table, min_support)
+elif args.top_k is None and args.output is None:
+    closed, maximal = find_closed_maximal(frequent_itemsets)
+if stats is not None:
+    stats.lap("closed_maximal")
+
+
+#################### ASSOCIATION RULES ####################
+if args.rules:
+    # The metrics of the rules are relative to the number of transactions, which are counted in the first scan.
+    # Only the results cached without it need a first scan of the dataset for counting them
+    if "transactions" not in scan_summary:
+        encode_dataset(dataset, min_support, is_header, scan_summary=scan_summary, sparse=sparse)
+    # The metrics are computed in NumPy batches if it is installed
+    rules = iter_association_rules(frequent_itemsets, scan_summary["transactions"], args.min_confidence,
+                                   args.min_lift, args.min_leverage)
+    names = item_dictionary.names
+    rules = ((tuple(sorted(names[item] for item in antecedent)), tuple(sorted(names[item] for item in consequent)),
+              *metrics) for antecedent, consequent, *metrics in rules)
+
+
+#################### RESULTS ####################
+# The mining works with item ids, which are decoded into item names only here
+if args.output is not None and args.rules:
+    # The rules are written instead of the itemsets, as they are generated
+    if args.sort:
+        rules = external_sort(rules)
+    with open_sink(args.output, args.output_format, RULE_FIELDS) as sink:
+        sink.write_all(rules)
+    print(f"ASSOCIATION RULES: {sink.count} written to {args.output}", file=sys.stderr)
+elif args.output is not None:
+    if args.top_k is not None:
+        label, itemsets = f"TOP-{args.top_k}", top_itemsets.items()
+    elif args.mode == "closed":
+        label, itemsets = "CLOSED", closed.items()
+    elif args.mode == "maximal":
+        label, itemsets = "MAXIMAL", maximal.items()
+    else:
+        label, itemsets = "FREQUENT", found_itemsets if found_itemsets is not None else frequent_itemsets.items()
+
+    # The itemsets are decoded one by one, with their items sorted, and written as they arrive
+    names = item_dictionary.names
+    itemsets = ((tuple(sorted(names[item] for item in itemset)), support) for itemset, support in itemsets)
+    if args.sort:
+        itemsets = external_sort(itemsets)
+    with open_sink(args.output, args.output_format) as sink:
+        sink.write_all(itemsets)
+    print(f"{label} ITEMSETS: {sink.count} written to {args.output}", file=sys.stderr)
+elif args.top_k is not None:
+    # Shown in descending order of support, with the items of each itemset sorted
+    top_itemsets = {tuple(sorted(itemset)): support
+                    for itemset, support in item_dictionary.decode_itemsets(top_itemsets).items()}
+    print(f"TOP-{args.top_k} ITEMSETS: {top_itemsets}")
+elif args.mode == "all":
+    print(f"FREQUENT ITEMSETS: {sort_frequent_itemsets(item_dictionary.decode_itemsets(frequent_itemsets))}")
+if args.output is None and args.top_k is None and args.mode in ("all", "closed"):
+    print(f"CLOSED ITEMSETS: {sort_frequent_itemsets(item_dictionary.decode_itemsets(closed))}")
+if args.output is None and args.top_k is None and args.mode in ("all", "maximal"):
+    print(f"MAXIMAL ITEMSETS: {sort_frequent_itemsets(item_dictionary.decode_itemsets(maximal))}")
+if args.output is None and args.rules:
+    print("ASSOCIATION RULES:")
+    for antecedent, consequent, support, confidence, lift, leverage in rules:
+        print(f"{antecedent} => {consequent}: support {support}, confidence {confidence:.4f}, lift {lift:.4f}, "
+              f"leverage {leverage:.4f}")
+if stats is not None:
+    # The rules are generated lazily, while they are written or printed
+    stats.lap("results")
+    stats.dump(args.profile)
+    print(f"PROFILE: written to {args.profile}", file=sys.stderr)
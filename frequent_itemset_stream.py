@@ -0,0 +1,63 @@
+"""
+Script for mining the frequent itemsets over a sliding window of a stream of transactions.
+
+To execute it use `python frequent_itemset_stream.py source min_support --window N`, where the source is a
+basket file, with the items of one transaction per line, or `-` for reading the transactions from stdin.
+The window can also be a period of time with `--window-time SECONDS`, and the supports can decay with `--decay`.
+"""
+import argparse
+import sys
+from algorithms import sort_frequent_itemsets
+from algorithms.stream_mining import SlidingWindowMiner
+from utils.loaders import DEFAULT_BUFFER_SIZE, open_dataset, parse_basket
+
+
+# Error pruning
+parser = argparse.ArgumentParser(description="Mine the frequent itemsets over a sliding window of a stream.")
+parser.add_argument("source", help="Path of the basket file, or - for reading from stdin.")
+parser.add_argument("min_support", type=float, help="Minimum support to consider an itemset frequent.")
+parser.add_argument("--window", type=int, default=None, help="Number of transactions in the window.")
+parser.add_argument("--window-time", type=float, default=None, help="Length of the window in seconds.")
+parser.add_argument("--decay", type=float, default=None,
+                    help="Factor applied to the weight of the transactions each time a new one arrives.")
+parser.add_argument("--every", type=int, default=1, help="Number of transactions between the reports.")
+parser.add_argument("--closed", action="store_true", help="Report the closed itemsets instead of all the frequent ones.")
+parser.add_argument("--timestamps", action="store_true",
+                    help="The first field of each line is the timestamp of the transaction, instead of its arrival time.")
+parser.add_argument("--delimiter", default=None, help="Item delimiter. Any whitespace by default.")
+args = parser.parse_args()
+if args.window is None and args.window_time is None:
+    parser.error("A window is needed: use --window or --window-time.")
+if args.every < 1:
+    parser.error("--every must be at least 1.")
+
+
+#################### STREAM ####################
+miner = SlidingWindowMiner(args.window, args.window_time, args.decay)
+source = sys.stdin if args.source == "-" else open_dataset(args.source, DEFAULT_BUFFER_SIZE)
+
+try:
+    n_transactions = 0
+    for line in source:
+        items = parse_basket(line, args.delimiter)
+        timestamp = None
+        if args.timestamps and items:
+            timestamp, items = float(items[0]), items[1:]
+        if not items:
+            continue
+        miner.add(items, timestamp)
+        n_transactions += 1
+
+        #################### RESULTS ####################
+        # The window is mined on demand, every given number of transactions
+        if n_transactions % args.every == 0:
+            if args.closed:
+                itemsets = miner.closed_itemsets(args.min_support)
+            else:
+                itemsets = miner.frequent_itemsets(args.min_support)
+            itemsets = sort_frequent_itemsets(miner.item_dictionary.decode_itemsets(itemsets))
+            label = "CLOSED" if args.closed else "FREQUENT"
+            print(f"TRANSACTION {n_transactions} ({len(miner)} IN WINDOW) - {label} ITEMSETS: {itemsets}", flush=True)
+finally:
+    if source is not sys.stdin:
+        source.close()
@@ -0,0 +1,43 @@
+"""
+Tests for the generation of association rules.
+
+To execute them use `python -m pytest tests`.
+"""
+from itertools import combinations
+
+import pytest
+
+from algorithms import association_rules, fp_tree_construction, fp_growth
+
+
+DATASET = [["A", "B", "C"], ["A", "B"], ["A", "C"], ["B", "C"], ["A", "B", "C"], ["A"]]
+
+
+def expected_rules(frequent_itemsets: dict, n_transactions: int, min_confidence: float):
+    """Generates the rules of every frequent itemset by brute force."""
+    supports = {frozenset(itemset): support for itemset, support in frequent_itemsets.items()}
+    rules = {}
+    for itemset, support in supports.items():
+        for size in range(1, len(itemset)):
+            for consequent in combinations(sorted(itemset), size):
+                antecedent = itemset - set(consequent)
+                confidence = support / supports[antecedent]
+                if confidence >= min_confidence:
+                    lift = confidence * n_transactions / supports[frozenset(consequent)]
+                    rules[(tuple(sorted(antecedent)), consequent)] = (support, confidence, lift)
+    return rules
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_association_rules_match_brute_force(vectorized):
+    _, header_table = fp_tree_construction(DATASET, 1, is_header=False)
+    frequent_itemsets = fp_growth(header_table, 1)
+
+    rules = association_rules(frequent_itemsets, len(DATASET), min_confidence=0.5, vectorized=vectorized)
+
+    found = {(antecedent, consequent): (support, confidence, lift)
+             for antecedent, consequent, support, confidence, lift, _ in rules}
+    expected = expected_rules(frequent_itemsets, len(DATASET), 0.5)
+    assert found.keys() == expected.keys()
+    for rule, metrics in expected.items():
+        assert found[rule] == pytest.approx(metrics)
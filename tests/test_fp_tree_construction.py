@@ -0,0 +1,67 @@
+"""
+Regression tests for reading the datasets in the construction of the FP-tree.
+
+To execute them use `python -m pytest tests`.
+"""
+import pytest
+
+from algorithms import fp_tree_construction, fp_growth, sort_frequent_itemsets
+from utils.binary_matrix import NUMPY_AVAILABLE, load_binary_matrix
+from utils.loaders import BasketTransactions, CSVTransactions
+
+
+def mine(dataset, minimum_support: int, is_header: bool = True, **options):
+    """Mines the frequent itemsets of a dataset, returned with item names and sorted."""
+    _, header_table = fp_tree_construction(dataset, minimum_support, is_header, **options)
+    frequent_itemsets = fp_growth(header_table, minimum_support)
+    return sort_frequent_itemsets(header_table.item_dictionary.decode_itemsets(frequent_itemsets))
+
+
+def test_binary_csv_with_blank_row(tmp_path):
+    file_path = tmp_path / "blank.csv"
+    file_path.write_text("A;B;C\n1;1;0\n\n0;1;1\n")
+
+    frequent_itemsets = mine(CSVTransactions(str(file_path), delimiter=";"), 1)
+
+    assert frequent_itemsets == {("A",): 1, ("A", "B"): 1, ("B",): 2, ("B", "C"): 1, ("C",): 1}
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy is not installed")
+def test_binary_matrix_with_blank_and_ragged_rows(tmp_path):
+    file_path = tmp_path / "blank.csv"
+    file_path.write_text("A;B;C\n1;1;0\n\n0;1;1;1\n1;1\n\n")
+
+    dataset = load_binary_matrix(str(file_path), delimiter=";")
+
+    assert len(dataset) == 3
+    assert mine(dataset, 1, is_header=False) == mine(CSVTransactions(str(file_path), delimiter=";"), 1)
+
+
+def test_binary_rows_blank_and_ragged():
+    dataset = [["A", "B", "C"], ["1", "1"], [], ["", "", ""], ["0", "1", "1", "1"], ["1", "1", "1"]]
+
+    frequent_itemsets = mine(dataset, 2)
+
+    assert frequent_itemsets == {("A",): 2, ("A", "B"): 2, ("B",): 3, ("B", "C"): 2, ("C",): 2}
+
+
+def test_blank_first_row_is_not_sparse():
+    dataset = [["A", "B"], [], ["1", "1"], ["0", "1"]]
+
+    assert mine(dataset, 1) == {("A",): 1, ("A", "B"): 1, ("B",): 2}
+
+
+def test_numeric_basket_file(tmp_path):
+    file_path = tmp_path / "numeric.txt"
+    file_path.write_text("0 1 2 3\n1 2\n2 3 4\n1 2 3\n")
+
+    frequent_itemsets = mine(BasketTransactions(str(file_path)), 2, is_header=False)
+
+    assert frequent_itemsets == {("1",): 3, ("1", "2"): 3, ("1", "2", "3"): 2, ("1", "3"): 2, ("2",): 4,
+                                 ("2", "3"): 3, ("3",): 3}
+
+
+def test_explicit_sparse_format():
+    dataset = [["0", "1"], ["1"], ["0", "1"]]
+
+    assert mine(dataset, 2, is_header=False, sparse=True) == {("0",): 2, ("0", "1"): 2, ("1",): 3}
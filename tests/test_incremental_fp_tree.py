@@ -0,0 +1,51 @@
+"""
+Tests for the incremental updates of the FP-tree, comparing the updated tree with one built from scratch.
+
+To execute them use `python -m pytest tests`.
+"""
+import random
+
+import pytest
+
+from algorithms import (fp_tree_construction, fp_growth, fp_close, fp_max, find_closed_maximal, sort_frequent_itemsets,
+                        update_fp_tree)
+
+
+ITEMS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+
+def random_transactions(seed: int, n_transactions: int, frequent: set, items: list = ITEMS):
+    """Generates transactions where the `frequent` items are much more likely than the rest."""
+    rng = random.Random(seed)
+    return [[item for item in items if rng.random() < (0.7 if item in frequent else 0.15)]
+            for _ in range(n_transactions)]
+
+
+def decoded(header_table, itemsets: dict):
+    """Decodes the itemsets found in a tree into item names, sorted."""
+    return sort_frequent_itemsets(header_table.item_dictionary.decode_itemsets(itemsets))
+
+
+@pytest.mark.parametrize("backend, order", [("node", "support"), ("slots", "support"), ("array", "canonical")])
+@pytest.mark.parametrize("seed", range(5))
+def test_update_matches_fresh_build(backend, order, seed):
+    # The first items are the most frequent at the beginning, and the batches make the last ones overtake
+    # them, so branches are restructured. H only appears with the updates
+    initial = random_transactions(seed, 30, {"A", "B", "C"}, ITEMS[:-1])
+    batches = [random_transactions(seed + 100, 25, {"F", "G", "H"}),
+               random_transactions(seed + 200, 25, {"D", "E", "H"})]
+    minimum_support = 3
+
+    fp_tree, header_table = fp_tree_construction(initial, 1, is_header=False, backend=backend)
+    for batch in batches:
+        fp_tree, header_table = update_fp_tree(fp_tree, header_table, batch, order=order)
+    _, fresh_header_table = fp_tree_construction(initial + batches[0] + batches[1], 1, is_header=False,
+                                                 backend=backend)
+
+    frequent_itemsets = decoded(header_table, fp_growth(header_table, minimum_support))
+    fresh_itemsets = fp_growth(fresh_header_table, minimum_support)
+    assert frequent_itemsets == decoded(fresh_header_table, fresh_itemsets)
+
+    closed, maximal = find_closed_maximal(fresh_itemsets, order=False)
+    assert decoded(header_table, fp_close(header_table, minimum_support)) == decoded(fresh_header_table, closed)
+    assert decoded(header_table, fp_max(header_table, minimum_support)) == decoded(fresh_header_table, maximal)
@@ -0,0 +1,27 @@
+"""
+Tests for the search of the closed and maximal itemsets.
+
+To execute them use `python -m pytest tests`.
+"""
+from algorithms.maximal_closed_itemset_mining import SubsetIndex, find_closed_maximal
+
+
+def test_subset_index_supersets():
+    index = SubsetIndex()
+    index.update([(0, 1, 2), (1, 2), (2, 3)])
+    index.add((0, 3))
+
+    assert index.supersets((1, 2)) == 0b0011
+    assert index.supersets((3,)) == 0b1100
+    assert index.supersets((0, 3)) == 0b1000
+    assert index.supersets((4,)) == 0
+    assert index.supersets(()) == 0b1111
+
+
+def test_find_closed_maximal():
+    frequent_itemsets = {("A",): 3, ("B",): 3, ("A", "B"): 3, ("C",): 2, ("A", "C"): 1}
+
+    closed, maximal = find_closed_maximal(frequent_itemsets, order=False)
+
+    assert closed == {("A", "B"): 3, ("C",): 2, ("A", "C"): 1}
+    assert maximal == {("A", "B"): 3, ("A", "C"): 1}
@@ -0,0 +1,32 @@
+"""
+Tests for mining the closed and maximal itemsets directly from the FP-tree.
+
+To execute them use `python -m pytest tests`.
+"""
+import random
+
+import pytest
+
+from algorithms import fp_tree_construction, fp_growth, fp_close, fp_max, find_closed_maximal
+
+
+def random_transactions(seed: int, n_transactions: int, n_items: int, density: float):
+    """Generates transactions of random items, each one present with the given probability."""
+    rng = random.Random(seed)
+    return [[f"I{item}" for item in range(n_items) if rng.random() < density] for _ in range(n_transactions)]
+
+
+@pytest.mark.parametrize("backend", ["node", "slots", "array"])
+@pytest.mark.parametrize("seed, density", [(seed, density) for seed in range(4) for density in (0.2, 0.5, 0.8)])
+def test_fp_close_and_fp_max_match_frequent_itemsets(backend, seed, density):
+    transactions = random_transactions(seed, 40, 8, density)
+    minimum_support = 2
+    _, header_table = fp_tree_construction(transactions, minimum_support, is_header=False, backend=backend)
+
+    closed, maximal = find_closed_maximal(fp_growth(header_table, minimum_support), order=False)
+
+    # The items of each itemset are found in a different order, so they are compared as sets
+    assert {frozenset(itemset): support for itemset, support in fp_close(header_table, minimum_support).items()} == \
+        {frozenset(itemset): support for itemset, support in closed.items()}
+    assert {frozenset(itemset): support for itemset, support in fp_max(header_table, minimum_support).items()} == \
+        {frozenset(itemset): support for itemset, support in maximal.items()}
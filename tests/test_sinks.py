@@ -0,0 +1,21 @@
+"""
+Tests for the sinks that write itemsets and association rules to files.
+
+To execute them use `python -m pytest tests`.
+"""
+import csv
+import json
+
+from utils.sinks import CSVSink
+
+
+def test_csv_itemsets_with_spaces_do_not_collide(tmp_path):
+    file_path = tmp_path / "itemsets.csv"
+    records = [(("whole milk", "bread"), 2), (("whole", "milk", "bread"), 1), (("a,b", 'say "hi"'), 1)]
+
+    with CSVSink(str(file_path)) as sink:
+        sink.write_all(records)
+
+    with open(file_path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [(tuple(json.loads(row["itemset"])), int(row["support"])) for row in rows] == records
@@ -0,0 +1,148 @@
+"""
+Classes and functions for handling binary datasets as NumPy matrices.
+
+NumPy is an optional dependency. When it is not installed, `NUMPY_AVAILABLE` is False and the
+datasets must be processed with the pure Python path of fp_tree_construction.
+"""
+from itertools import islice
+
+from utils.loaders import DEFAULT_BUFFER_SIZE, CSVTransactions, is_blank_row
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Number of rows processed at once, which bounds the memory used by the intermediate arrays
+CHUNK_SIZE = 65536
+
+
+class BinaryMatrix:
+    """
+    Binary dataset stored as a NumPy matrix, with one row per transaction and one column per item.
+
+    It can be passed to fp_tree_construction instead of a list. The supports of the items are then
+    computed as column sums, and the transactions are emitted in bulk, already filtered and sorted.
+
+    Arguments:
+        matrix (numpy.ndarray): Matrix of 0/1 values. It can be a memory-mapped array.
+        header (list): List with the item's names, one for each column.
+    """
+    def __init__(self, matrix, header: list):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for using binary matrices.")
+        if matrix.ndim != 2 or matrix.shape[1] != len(header):
+            raise ValueError("The matrix must have one column for each item in the header.")
+        self.matrix = matrix
+        self.header = list(header)
+
+    def __len__(self):
+        """Returns the number of transactions."""
+        return self.matrix.shape[0]
+
+    def first_scan(self, minimum_support: int = 1):
+        """
+        Applies the first scan to obtain the support of the 1-item frequent itemsets.
+
+        Arguments:
+            minimum_support (int): The minimum support threshold to determine frequent itemsets (default=1).
+
+        Returns:
+            item_order (list): List with the items sorted in descending order of support.
+            item_support (dict): Dictionary containing the support of the 1-item itemsets.
+        """
+        support = self.matrix.sum(axis=0, dtype=np.int64)
+        frequent = np.flatnonzero(support >= minimum_support)
+        # Stable sort, so items with the same support keep the order of the header as in first_scan
+        columns = frequent[np.argsort(-support[frequent], kind="stable")]
+
+        item_order = [self.header[column] for column in columns.tolist()]
+        item_support = {item: count for item, count in zip(item_order, support[columns].tolist())}
+        return item_order, item_support
+
+    def sorted_transactions(self, item_order: list, chunk_size: int = CHUNK_SIZE):
+        """
+        Emits the transactions as lists of item ranks in `item_order`, which are the item ids of the tree.
+
+        The columns of the frequent items are reordered by support, so the ranks of each row come out
+        already sorted. Identical rows are merged, and each distinct transaction is yielded once with its count.
+
+        Arguments:
+            item_order (list): List with the items sorted in descending order of support.
+            chunk_size (int): Number of rows processed at once (default=CHUNK_SIZE).
+
+        Yields:
+            tuple: The list of item ranks of a transaction and the number of times it appears.
+        """
+        column = {item: i for i, item in enumerate(self.header)}
+        columns = np.array([column[item] for item in item_order], dtype=np.intp)
+        if len(columns) == 0:
+            return
+
+        for start in range(0, len(self), chunk_size):
+            chunk = self.matrix[start:start + chunk_size][:, columns].astype(bool)
+            rows, counts = np.unique(chunk, axis=0, return_counts=True)
+            row_index, ranks = np.nonzero(rows)
+            # Positions where the items of each row end, since np.nonzero returns them row by row
+            ends = np.cumsum(np.bincount(row_index, minlength=len(rows))).tolist()
+            ranks = ranks.tolist()
+            begin = 0
+            for end, count in zip(ends, counts.tolist()):
+                if end > begin:
+                    yield ranks[begin:end], count
+                begin = end
+
+
+def load_binary_matrix(file_path: str, delimiter: str = None, mmap_path: str = None,
+                       buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Loads a binary CSV dataset with a header row as a BinaryMatrix of uint8 values.
+
+    The rows are read as in the pure Python path of fp_tree_construction: blank rows are skipped, the
+    rows shorter than the header are padded with absent items and the values beyond the header are ignored.
+    An item is present if its value is "1".
+
+    Arguments:
+        file_path (str): Path of the file, which can be compressed with gzip.
+        delimiter (str): Character separating the values. It is detected from the beginning of the file
+            if it is None (default=None).
+        mmap_path (str): Path of a .npy file where the matrix is stored and memory-mapped, instead of keeping
+            it in memory (default=None).
+        buffer_size (int): Size in bytes of the read buffer (default=DEFAULT_BUFFER_SIZE).
+
+    Returns:
+        BinaryMatrix: The dataset.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for loading binary matrices.")
+
+    # The file is streamed twice: first for counting the transactions and then for filling the matrix
+    dataset = CSVTransactions(file_path, delimiter, buffer_size)
+    rows = iter(dataset)
+    header = next(rows)
+    n_transactions = sum(1 for row in rows if not is_blank_row(row))
+
+    if mmap_path is None:
+        matrix = np.zeros((n_transactions, len(header)), dtype=np.uint8)
+    else:
+        matrix = np.lib.format.open_memmap(mmap_path, mode="w+", dtype=np.uint8, shape=(n_transactions, len(header)))
+
+    # The rows are parsed in chunks to avoid holding the whole file as Python strings
+    rows = iter(dataset)
+    next(rows)
+    # Every row is cut or padded to the width of the header, so the chunks are rectangular
+    width = len(header)
+    rows = (row[:width] + ["0"] * (width - len(row)) for row in rows if not is_blank_row(row))
+    start = 0
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        matrix[start:start + len(chunk)] = np.array(chunk, dtype=str) == "1"
+        start += len(chunk)
+
+    if mmap_path is not None:
+        matrix.flush()
+    return BinaryMatrix(matrix, header)
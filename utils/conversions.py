@@ -62,6 +62,7 @@ def transaction_to_binary(transaction_data):
     # binary_data.append(header)
 
     for transaction in transaction_data:
+        transaction = set(transaction) # Constant time membership tests
         binary_row = [1 if item in transaction else 0 for item in header]
         binary_data.append(binary_row)
 
@@ -0,0 +1,132 @@
+"""
+Functions and classes for loading datasets from files.
+"""
+import csv
+import gzip
+import io
+
+
+# Size in bytes of the buffer used for reading the files
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# First bytes of every gzip file
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_dataset(file_path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Opens a dataset file for reading as text, decompressing it on the fly if it is a gzip file.
+
+    Arguments:
+        file_path (str): Path of the file.
+        buffer_size (int): Size in bytes of the read buffer (default=DEFAULT_BUFFER_SIZE).
+
+    Returns:
+        TextIO: File object, which reads the file in chunks of `buffer_size` bytes.
+    """
+    with open(file_path, mode="rb") as file:
+        is_gzip = file.read(2) == GZIP_MAGIC
+
+    if is_gzip:
+        return io.TextIOWrapper(io.BufferedReader(gzip.open(file_path, mode="rb"), buffer_size), newline="")
+    return open(file_path, mode="r", buffering=buffer_size, newline="")
+
+
+def parse_basket(line: str, delimiter: str = None):
+    """
+    Parses a line of a basket file into the list of its items.
+
+    Arguments:
+        line (str): Line of the file.
+        delimiter (str): Character separating the items. Any whitespace is used if it is None (default=None).
+
+    Returns:
+        list: Items of the basket, without duplicates and in order of appearance.
+    """
+    items = (item.strip() for item in line.split(delimiter))
+    return list(dict.fromkeys(item for item in items if item))
+
+
+def is_blank_row(row):
+    """
+    Checks whether a row has no values, like the blank lines of a file, which are not transactions.
+
+    Arguments:
+        row (list): Row of the dataset.
+    """
+    return not row or all(value == "" for value in row)
+
+
+class CSVTransactions:
+    """
+    Dataset stored in a CSV file, which is streamed from disk every time it is iterated.
+
+    It can be passed to fp_tree_construction instead of a list, so the file is read twice (once for
+    each scan) and the whole dataset is never held in memory. The first row is the header.
+
+    Arguments:
+        file_path (str): Path of the file, which can be compressed with gzip.
+        delimiter (str): Character separating the values. It is detected from the beginning of the file
+            if it is None (default=None).
+        buffer_size (int): Size in bytes of the read buffer (default=DEFAULT_BUFFER_SIZE).
+    """
+    def __init__(self, file_path: str, delimiter: str = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        if delimiter is None:
+            # Get the delimiter used in the dataset using the Sniffer class of the CSV internal library
+            with open_dataset(file_path, buffer_size) as file:
+                delimiter = csv.Sniffer().sniff(file.read(1024)).delimiter
+        self.delimiter = delimiter
+
+    def __iter__(self):
+        """Iterates over the rows of the file, starting with the header."""
+        with open_dataset(self.file_path, self.buffer_size) as file:
+            yield from csv.reader(file, delimiter=self.delimiter)
+
+
+class BasketTransactions:
+    """
+    Dataset stored in a basket file, with the items of one transaction per line, which is streamed
+    from disk every time it is iterated.
+
+    The transactions are yielded in sparse format, as the lists of the items they contain, and the
+    file has no header. Example of file with `delimiter=","`:
+        apple,banana,carrot
+        banana
+
+    Arguments:
+        file_path (str): Path of the file, which can be compressed with gzip.
+        delimiter (str): Character separating the items. Any whitespace is used if it is None (default=None).
+        buffer_size (int): Size in bytes of the read buffer (default=DEFAULT_BUFFER_SIZE).
+    """
+    # The transactions are lists of items, even if they are numbers like "0" and "1"
+    sparse = True
+
+    def __init__(self, file_path: str, delimiter: str = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.file_path = file_path
+        self.delimiter = delimiter
+        self.buffer_size = buffer_size
+
+    def __iter__(self):
+        """Iterates over the transactions of the file."""
+        with open_dataset(self.file_path, self.buffer_size) as file:
+            for line in file:
+                yield parse_basket(line, self.delimiter)
+
+
+def read_baskets(file_path: str, delimiter: str = None):
+    """
+    Reads a dataset in basket format, with the items of one transaction per line.
+
+    The transactions are returned in sparse format, as the lists of the items they contain,
+    which can be passed directly to fp_tree_construction with `is_header=False`.
+
+    Arguments:
+        file_path (str): Path of the file, which can be compressed with gzip.
+        delimiter (str): Character separating the items. Any whitespace is used if it is None (default=None).
+
+    Returns:
+        list: Dataset in sparse format. Example: [['apple', 'banana', 'carrot'], ['banana'], ...]
+    """
+    return list(BasketTransactions(file_path, delimiter))
@@ -0,0 +1,198 @@
+"""
+Sinks for writing itemsets (or association rules) to files as they are produced, and external sorting for
+large outputs.
+"""
+import csv
+import heapq
+import json
+import pickle
+import sys
+import tempfile
+from itertools import islice
+
+
+# Number of itemsets sorted in memory at once by external_sort
+SORT_CHUNK_SIZE = 1000000
+
+# Fields of the records written by default
+ITEMSET_FIELDS = ("itemset", "support")
+
+
+class ItemsetSink:
+    """
+    Base class of the sinks, which write (itemset, support) pairs to a file, or to stdout with the path "-".
+    Records with other fields, like association rules, can be written with `write_row`. The sinks are
+    context managers, and keep the number of records written in `count`.
+
+    Arguments:
+        file_path (str): Path of the output file, or "-" for stdout.
+        fields (tuple): Names of the fields of the records (default=ITEMSET_FIELDS).
+    """
+    def __init__(self, file_path: str, fields: tuple = ITEMSET_FIELDS):
+        self.file_path = file_path
+        self.fields = tuple(fields)
+        self.file = sys.stdout if file_path == "-" else open(file_path, mode="w", newline="", encoding="utf-8")
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_row(self, values):
+        """
+        Writes a record. Its values are given in the order of `fields`, and itemsets are tuples of items.
+
+        Arguments:
+            values (tuple): Values of the record.
+        """
+        raise NotImplementedError
+
+    def write(self, itemset, support):
+        """
+        Writes an itemset.
+
+        Arguments:
+            itemset (tuple): Items of the itemset.
+            support (int): Support of the itemset.
+        """
+        self.write_row((itemset, support))
+
+    def write_all(self, records):
+        """
+        Writes all the records of an iterable, like (itemset, support) pairs, consuming it lazily.
+
+        Arguments:
+            records (iterable): The records.
+        """
+        for values in records:
+            self.write_row(values)
+
+    def close(self):
+        """Closes the file, unless it is stdout."""
+        if self.file is sys.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+
+class CSVSink(ItemsetSink):
+    """
+    Sink writing a CSV file with a column for each field, like "itemset" and "support". Each itemset is
+    written as a JSON array of its items, like ["whole milk", "bread"], so item names containing spaces or
+    any other separator are kept apart and the cell can be read back with json.loads.
+
+    Arguments:
+        file_path (str): Path of the output file, or "-" for stdout.
+        fields (tuple): Names of the fields of the records (default=ITEMSET_FIELDS).
+    """
+    def __init__(self, file_path: str, fields: tuple = ITEMSET_FIELDS):
+        super().__init__(file_path, fields)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.fields)
+
+    def write_row(self, values):
+        self.writer.writerow([json.dumps(list(value), ensure_ascii=False) if isinstance(value, tuple) else value
+                              for value in values])
+        self.count += 1
+
+
+class JSONLSink(ItemsetSink):
+    """
+    Sink writing a JSON Lines file, with one object per line, like {"itemset": [...], "support": ...}.
+
+    Arguments:
+        file_path (str): Path of the output file, or "-" for stdout.
+        fields (tuple): Names of the fields of the records (default=ITEMSET_FIELDS).
+    """
+    def write_row(self, values):
+        self.file.write(json.dumps(dict(zip(self.fields, values)), ensure_ascii=False))
+        self.file.write("\n")
+        self.count += 1
+
+
+# Sinks available by format name
+SINKS = {
+    "csv": CSVSink,
+    "jsonl": JSONLSink,
+}
+
+
+def open_sink(file_path: str, output_format: str = None, fields: tuple = ITEMSET_FIELDS):
+    """
+    Opens a sink for writing itemsets, or other records.
+
+    Arguments:
+        file_path (str): Path of the output file, or "-" for stdout.
+        output_format (str): "csv" or "jsonl". It is taken from the extension of the file if it is None,
+            with CSV by default (default=None).
+        fields (tuple): Names of the fields of the records (default=ITEMSET_FIELDS).
+
+    Returns:
+        ItemsetSink: The sink.
+    """
+    if output_format is None:
+        output_format = "jsonl" if file_path.endswith((".jsonl", ".json")) else "csv"
+    if output_format not in SINKS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return SINKS[output_format](file_path, fields)
+
+
+def _read_run(file):
+    """
+    Iterates over the records of a sorted run written by external_sort, closing the file at the end.
+
+    Arguments:
+        file (BinaryIO): File of the run, at its beginning.
+    """
+    with file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def external_sort(records, chunk_size: int = SORT_CHUNK_SIZE, temp_dir: str = None):
+    """
+    Sorts an iterable of records that may not fit in memory.
+
+    The records are sorted in chunks of `chunk_size`, and each sorted chunk (run) is written to a
+    temporary file. The runs are then merged lazily, holding only one record of each run in memory.
+    If all the records fit in a single chunk, they are sorted in memory.
+
+    Arguments:
+        records (iterable): Records to sort, like (itemset, support) pairs.
+        chunk_size (int): Number of records sorted in memory at once (default=SORT_CHUNK_SIZE).
+        temp_dir (str): Directory of the temporary files. The default one of the system is used if
+            it is None (default=None).
+
+    Yields:
+        The records in ascending order.
+    """
+    records = iter(records)
+    runs = []
+    try:
+        while True:
+            chunk = sorted(islice(records, chunk_size))
+            if not chunk:
+                break
+            if not runs and len(chunk) < chunk_size:
+                yield from chunk
+                return
+            run = tempfile.TemporaryFile(dir=temp_dir)
+            pickler = pickle.Pickler(run, protocol=pickle.HIGHEST_PROTOCOL)
+            for record in chunk:
+                pickler.dump(record)
+                # The memo would keep a reference to every record written
+                pickler.clear_memo()
+            run.seek(0)
+            runs.append(run)
+            del chunk
+
+        yield from heapq.merge(*(_read_run(run) for run in runs))
+    finally:
+        for run in runs:
+            if not run.closed:
+                run.close()